@@ -0,0 +1,329 @@
+"""
+==============================================================================
+NBA ORACLE — Multi-Season Batch Scoring & Backtest
+==============================================================================
+Purpose: process_predictions.py only scores PREDICTION_SEASON; every other
+         season is passed through as history. This script scores EVERY
+         season in the prediction CSVs the same way and checks the result
+         against what actually happened (MadePlayoffs_orig), so we can see
+         how the overall rating and the clinched / eliminated thresholds
+         would have worked in past years.
+
+HOW IT WORKS:
+  1. Load every division CSV once (load_prediction_csv) into one flat set
+     of columns and group the row indices by season.
+  2. Per season, in one batch: global bounds over that season's teams
+     (compute_bounds), all normalized scores + overall rating
+     (score_columns), status labels (playoff_status) and division
+     analytics (division_analytics) — exactly what the dashboard would
+     have shown that year.
+  3. Compare with MadePlayoffs_orig:
+       status           clinched → predicted in, eliminated → predicted out,
+                        contender → no call. Precision per label, accuracy
+                        over the decisive calls, and coverage (share of
+                        teams that got a decisive call).
+       overall_rating   AUC (chance a playoff team outranks a non-playoff
+                        team) and top-k accuracy (k = actual playoff teams:
+                        share of the k best-rated teams that made it).
+       calibration      Brier score, expected calibration error and a
+                        reliability table of 1_predicted_proba in `bins`
+                        equal-width buckets.
+     The same metrics are also computed over all seasons pooled.
+  4. Write everything to csvnba/backtest.json (an internal report, so it
+     stays out of the deployed site) and print one line per season.
+
+  Note: the predicted season's MadePlayoffs_orig is the export's own label,
+  not a final result, so its row is reported but worth reading with care.
+
+USAGE:
+  python process/backtest.py
+  python process/backtest.py --weight win_pct=0.3 --bins 5 -o /tmp/backtest.json
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from array import array
+from itertools import groupby
+from operator import itemgetter
+
+from instrument import configure_logging
+from prediction_columns import load_prediction_csv
+from process_predictions import (AZURE_FOLDER, CLINCHED_THRESHOLD, ELIMINATED_THRESHOLD,
+                                 PREDICTION_SEASON, REPO_ROOT, division_analytics, parse_pairs,
+                                 playoff_status, resolve_csv_files, resolve_sources)
+from publish import atomic_write
+from records import TeamSeason
+from scoring import (DEFAULT_SCORE_SPECS, OVERALL_KEY, compute_bounds, score_columns, stat_columns,
+                     with_weights)
+
+
+log = logging.getLogger('backtest')
+
+# Next to the source data, outside the deployed azure_predictions/ tree
+BACKTEST_PATH = os.path.join(REPO_ROOT, 'csvnba', 'backtest.json')
+CALIBRATION_BINS = 10
+
+
+# =============================================================================
+# STEP 1: LOAD EVERY SEASON (one flat set of columns, grouped by season)
+# =============================================================================
+class LeagueColumns:
+    """Rows of every division CSV, aligned by position."""
+
+    __slots__ = ('season', 'team', 'division', 'win_pct', 'off_rating', 'def_rating',
+                 'predicted_proba', 'made_playoffs')
+
+    def __init__(self):
+        self.season, self.team, self.division = [], [], []
+        self.win_pct, self.off_rating, self.def_rating = array('d'), array('d'), array('d')
+        self.predicted_proba = array('d')
+        self.made_playoffs = array('b')
+
+    def __len__(self):
+        return len(self.team)
+
+    def extend(self, div_key, cols):
+        """Appends one division's PredictionColumns."""
+        self.season.extend(cols.season)
+        self.team.extend(cols.team)
+        self.division.extend([div_key] * len(cols))
+        for name in ('win_pct', 'off_rating', 'def_rating', 'predicted_proba', 'made_playoffs'):
+            getattr(self, name).extend(getattr(cols, name))
+
+    def by_season(self):
+        """{season: [row indices]}, seasons in sorted order."""
+        groups = {}
+        for i, season in enumerate(self.season):
+            groups.setdefault(season, []).append(i)
+        return {season: groups[season] for season in sorted(groups)}
+
+
+def load_league(azure_folder=AZURE_FOLDER, csv_files=None):
+    league = LeagueColumns()
+    for div_key, filepath in resolve_sources(azure_folder, csv_files):
+        league.extend(div_key, load_prediction_csv(filepath))
+    return league
+
+
+# =============================================================================
+# STEP 3: METRICS
+# =============================================================================
+def auc(scores, labels):
+    """
+    Area under the ROC curve: P(score of a positive > score of a negative),
+    ties counting one half (Mann-Whitney U on average ranks). None when only
+    one class is present.
+    """
+    positives = sum(labels)
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return None
+    rank_sum = 0.0
+    seen = 0
+    for _, tied in groupby(sorted(zip(scores, labels)), key=itemgetter(0)):
+        tied = [made for _, made in tied]
+        # 1-based ranks seen+1 .. seen+n; tied scores share the mean rank
+        rank_sum += (seen + (len(tied) + 1) / 2) * sum(tied)
+        seen += len(tied)
+    return (rank_sum - positives * (positives + 1) / 2) / (positives * negatives)
+
+
+def _ratio(numerator, denominator, digits=3):
+    return round(numerator / denominator, digits) if denominator else None
+
+
+def status_summary(statuses, labels):
+    """How the clinched / contender / eliminated labels matched reality."""
+    counts = {"clinched": [0, 0], "contender": [0, 0], "eliminated": [0, 0]}  # [teams, made]
+    for status, made in zip(statuses, labels):
+        counts[status][0] += 1
+        counts[status][1] += made
+    clinched, made_clinched = counts["clinched"]
+    eliminated, made_eliminated = counts["eliminated"]
+    correct = made_clinched + (eliminated - made_eliminated)
+    return {
+        "counts": {status: n for status, (n, _) in counts.items()},
+        "made_playoffs_rate": {status: _ratio(made, n) for status, (n, made) in counts.items()},
+        "clinched_precision": _ratio(made_clinched, clinched),
+        "eliminated_precision": _ratio(eliminated - made_eliminated, eliminated),
+        "decisive_accuracy": _ratio(correct, clinched + eliminated),
+        "coverage": _ratio(clinched + eliminated, len(labels)),
+    }
+
+
+def ranking_summary(ratings, labels):
+    """AUC and top-k accuracy of the overall rating (k = actual playoff teams)."""
+    k = sum(labels)
+    top = sorted(range(len(ratings)), key=lambda i: -ratings[i])[:k]
+    area = auc(ratings, labels)
+    return {
+        "auc": round(area, 3) if area is not None else None,
+        "top_k": k,
+        "top_k_accuracy": _ratio(sum(labels[i] for i in top), k),
+    }
+
+
+def calibration_summary(probs, labels, bins=CALIBRATION_BINS):
+    """Brier score, expected calibration error and a reliability table."""
+    buckets = [[0, 0.0, 0] for _ in range(bins)]  # [teams, Σ predicted, made]
+    brier = 0.0
+    for p, made in zip(probs, labels):
+        brier += (p - made) ** 2
+        bucket = buckets[min(int(p * bins), bins - 1)]
+        bucket[0] += 1
+        bucket[1] += p
+        bucket[2] += made
+    n = len(probs)
+    ece = sum(abs(total_p - made) for _, total_p, made in buckets) / n if n else None
+    return {
+        "brier": round(brier / n, 4) if n else None,
+        "ece": round(ece, 4) if ece is not None else None,
+        "bins": [
+            {"range": [round(b / bins, 3), round((b + 1) / bins, 3)], "teams": count,
+             "mean_predicted": _ratio(total_p, count), "observed": _ratio(made, count)}
+            for b, (count, total_p, made) in enumerate(buckets) if count
+        ],
+    }
+
+
+def evaluate(statuses, ratings, probs, labels, bins=CALIBRATION_BINS):
+    return {
+        "teams": len(labels),
+        "playoff_teams": sum(labels),
+        "status": status_summary(statuses, labels),
+        "overall_rating": ranking_summary(ratings, labels),
+        "model_proba": {"auc": round(a, 3) if (a := auc(probs, labels)) is not None else None},
+        "calibration": calibration_summary(probs, labels, bins),
+    }
+
+
+# =============================================================================
+# STEP 2 + 4: SCORE EVERY SEASON AND WRITE THE REPORT
+# =============================================================================
+def score_season(league, rows, score_specs=DEFAULT_SCORE_SPECS):
+    """
+    One season in one batch: (bounds, scores, statuses, division analytics).
+
+    scores / statuses are aligned with rows.
+    """
+    statuses = [playoff_status(league.predicted_proba[i]) for i in rows]
+    teams = []
+    for pos, i in enumerate(rows):
+        off, dfn = league.off_rating[i], league.def_rating[i]
+        teams.append(TeamSeason(league.team[i], league.season[i], league.win_pct[i], off, dfn,
+                                round(off - dfn, 1), league.predicted_proba[i], statuses[pos]))
+    columns = stat_columns(teams, score_specs)
+    bounds = compute_bounds(columns, score_specs)
+    scores = score_columns(columns, bounds, score_specs)
+
+    # Division analytics exactly as the dashboard computes them (best first)
+    divisions = {}
+    for team, i in zip(teams, rows):
+        divisions.setdefault(league.division[i], []).append(team)
+    analytics = {}
+    for div_key, teams in divisions.items():
+        teams.sort(key=lambda x: x.proba, reverse=True)
+        analytics[div_key] = division_analytics(teams)
+    return bounds, scores, statuses, analytics
+
+
+def run_backtest(league, score_specs=DEFAULT_SCORE_SPECS, bins=CALIBRATION_BINS):
+    """Per-season (and pooled) report for every season in the league."""
+    report = {
+        "meta": {
+            "prediction_season": PREDICTION_SEASON,
+            "thresholds": {"clinched": CLINCHED_THRESHOLD, "eliminated": ELIMINATED_THRESHOLD},
+            "weights": {spec.stat: spec.weight for spec in score_specs},
+            "calibration_bins": bins,
+        },
+        "seasons": {},
+    }
+    pooled = ([], [], [], [])  # statuses, ratings, probs, labels over all seasons
+    for season, rows in league.by_season().items():
+        bounds, scores, statuses, analytics = score_season(league, rows, score_specs)
+        ratings = scores[OVERALL_KEY]
+        probs = [league.predicted_proba[i] for i in rows]
+        labels = [league.made_playoffs[i] for i in rows]
+        summary = evaluate(statuses, ratings, probs, labels, bins)
+        summary["bounds"] = {stat: list(b) for stat, b in bounds.items()}
+        summary["division_analytics"] = analytics
+        report["seasons"][season] = summary
+        for acc, values in zip(pooled, (statuses, ratings, probs, labels)):
+            acc.extend(values)
+    report["all_seasons"] = evaluate(*pooled, bins)
+    return report
+
+
+def _fmt(value, spec='.3f'):
+    return '  n/a' if value is None else format(value, spec)
+
+
+def print_report(report):
+    print(f"{'Season':9s} {'Teams':>5s} {'Made':>4s} {'Clinch':>6s} {'Elim':>6s} "
+          f"{'Decis':>6s} {'Cover':>6s} {'RtgAUC':>6s} {'TopK':>6s} {'Brier':>6s} {'ECE':>6s}")
+    rows = list(report["seasons"].items()) + [("all", report["all_seasons"])]
+    for season, s in rows:
+        st, rk, cal = s["status"], s["overall_rating"], s["calibration"]
+        print(f"{season:9s} {s['teams']:5d} {s['playoff_teams']:4d} "
+              f"{_fmt(st['clinched_precision']):>6s} {_fmt(st['eliminated_precision']):>6s} "
+              f"{_fmt(st['decisive_accuracy']):>6s} {_fmt(st['coverage']):>6s} "
+              f"{_fmt(rk['auc']):>6s} {_fmt(rk['top_k_accuracy']):>6s} "
+              f"{_fmt(cal['brier'], '.4f'):>6s} {_fmt(cal['ece'], '.4f'):>6s}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Score every season in the prediction CSVs and backtest against MadePlayoffs_orig.")
+    parser.add_argument('--input-dir', default=AZURE_FOLDER,
+                        help="folder containing the prediction CSVs (default: %(default)s)")
+    files = parser.add_mutually_exclusive_group()
+    files.add_argument('--division', action='append', metavar='KEY=FILE',
+                       help="division key → CSV file (relative to --input-dir); repeatable")
+    files.add_argument('--glob', metavar='PATTERN',
+                       help="pick up every CSV matching PATTERN in --input-dir")
+    parser.add_argument('-o', '--output', default=BACKTEST_PATH,
+                        help="report JSON path (default: %(default)s)")
+    parser.add_argument('--weight', action='append', metavar='STAT=WEIGHT',
+                        help="override an overall-rating weight, e.g. win_pct=0.3; repeatable")
+    parser.add_argument('--bins', type=int, default=CALIBRATION_BINS,
+                        help="calibration buckets (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    configure_logging()
+    if args.bins < 1:
+        parser.error("--bins must be at least 1")
+
+    score_specs = DEFAULT_SCORE_SPECS
+    if args.weight:
+        try:
+            score_specs = with_weights(score_specs, parse_pairs(args.weight, parser, '--weight', float))
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    start = time.perf_counter()
+    league = load_league(args.input_dir, resolve_csv_files(args, parser))
+    if not len(league):
+        print("No data found!", file=sys.stderr)
+        return 1
+    report = run_backtest(league, score_specs, args.bins)
+    elapsed = time.perf_counter() - start
+
+    with atomic_write(args.output) as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\n{len(report['seasons'])} seasons, {len(league)} team-seasons scored in "
+          f"{elapsed * 1000:.1f} ms → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,284 @@
+"""
+==============================================================================
+NBA ORACLE — Post-Processor Benchmark
+==============================================================================
+Purpose: Measures process_predictions.py stage by stage on synthetic data,
+         so a speedup can be proven (and a regression caught) by comparing
+         the JSON results of two commits.
+
+WHAT IT DOES:
+  1. Generates Azure-ML-style prediction CSVs (same columns as
+     csvnba/azure_predictions/*.csv) at any scale:
+         rows = divisions × teams per division × seasons
+  2. Times every stage of process_csvs() separately, best and median of
+     --repeat runs:
+         ingest            load_prediction_csv()           (STEP 3)
+         history           split_season() + group_history() (STEP 3a)
+         teams             current_season_teams()          (STEP 3b)
+         bounds            compute_bounds()                (STEP 4)
+         normalization     score_columns() + rounding      (STEP 5b)
+         division_analytics sort + division_analytics()    (STEP 5a)
+         serialization     json.dumps(indent=2)            (STEP 6)
+     plus the whole process_csvs() run end to end (no build cache).
+  3. Runs every stage once more under tracemalloc for its peak memory
+     (kept out of the timed runs, tracing slows Python down a lot).
+  4. Writes everything as JSON, tagged with the git commit.
+
+USAGE:
+  python process/benchmark.py --teams 5 --seasons 10 --divisions 6
+  python process/benchmark.py --teams 1000 --seasons 50 --divisions 20 -o bench.json
+==============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from prediction_columns import load_prediction_csv
+from process_predictions import (PREDICTION_SEASON, current_season_teams, division_analytics,
+                                 group_history, process_csvs)
+from scoring import (DEFAULT_SCORE_SPECS, compute_bounds, rounded_scores, score_columns,
+                     stat_columns)
+
+
+# Same header as the Azure ML exports (ThreeP_Pct_orig only exists in some)
+CSV_HEADER = [
+    "MadePlayoffs_orig", "MadePlayoffs_predicted", "0_predicted_proba", "1_predicted_proba",
+    "Season_orig", "Team_orig", "Win_Pct_orig", "Off_Rating_orig", "Def_Rating_orig",
+]
+
+STAGES = ["ingest", "history", "teams", "bounds", "normalization",
+          "division_analytics", "serialization"]
+
+
+# =============================================================================
+# STEP 1: SYNTHETIC LEAGUE
+# =============================================================================
+def season_labels(count, last=PREDICTION_SEASON):
+    """The `count` seasons ending with `last`, oldest first: ..., "2024-25", "2025-26"."""
+    end = int(last[:4])
+    return [f"{year}-{(year + 1) % 100:02d}" for year in range(end - count + 1, end + 1)]
+
+
+def generate_league(out_dir, teams=5, seasons=10, divisions=6, seed=0):
+    """
+    Writes one prediction CSV per division into out_dir.
+
+    Returns {division key: file name} (the csv_files mapping process_csvs()
+    expects). Rows are newest season first, like the real exports.
+    """
+    rng = random.Random(seed)
+    labels = season_labels(seasons)[::-1]
+    csv_files = {}
+    os.makedirs(out_dir, exist_ok=True)
+    for d in range(divisions):
+        div_key = f"division{d + 1:02d}"
+        filename = f"{div_key}_predictions.csv"
+        with open(os.path.join(out_dir, filename), 'w', encoding='utf-8', newline='') as f:
+            f.write(",".join(CSV_HEADER) + "\n")
+            for season in labels:
+                for t in range(teams):
+                    win_pct = round(rng.uniform(0.15, 0.85), 3)
+                    off_rating = round(rng.uniform(105.0, 122.0), 1)
+                    def_rating = round(rng.uniform(105.0, 122.0), 1)
+                    proba = rng.random()
+                    made = int(win_pct >= 0.5)
+                    f.write(f"{made},{int(proba >= 0.5)},{1 - proba!r},{proba!r},{season},"
+                            f"Synthetic Team D{d + 1:02d}-{t + 1:04d},"
+                            f"{win_pct},{off_rating},{def_rating}\n")
+        csv_files[div_key] = filename
+    return csv_files
+
+
+# =============================================================================
+# STEP 2: THE STAGES (the same calls process_csvs() makes, one at a time)
+# =============================================================================
+def run_stages(paths, score_specs=DEFAULT_SCORE_SPECS, stage_hook=None):
+    """
+    Runs the pipeline on the given CSV paths, calling stage_hook(name)
+    as a context manager around each stage. Returns the final JSON text.
+    """
+    hook = stage_hook or (lambda name: contextlib.nullcontext())
+
+    with hook("ingest"):
+        columns = [load_prediction_csv(path) for path in paths]
+
+    with hook("history"):
+        split = [cols.split_season(PREDICTION_SEASON) for cols in columns]
+        histories = [group_history(cols, hist) for cols, (_, hist) in zip(columns, split)]
+
+    with hook("teams"):
+        divisions = [current_season_teams(cols, current, history)
+                     for cols, (current, _), history in zip(columns, split, histories)]
+        all_teams = [t for teams in divisions for t in teams]
+
+    with hook("bounds"):
+        columns = stat_columns(all_teams, score_specs)
+        bounds = compute_bounds(columns, score_specs)
+
+    with hook("normalization"):
+        scores = score_columns(columns, bounds, score_specs)
+        normalized = [rounded_scores(scores, i) for i in range(len(all_teams))]
+
+    with hook("division_analytics"):
+        analytics = [division_analytics(sorted(teams, key=lambda x: x.proba, reverse=True))
+                     if teams else None for teams in divisions]
+
+    with hook("serialization"):
+        final_data = {"divisions": {}}
+        i = 0
+        for n, (teams, summary) in enumerate(zip(divisions, analytics)):
+            team_json = [t.to_json(ns) for t, ns in zip(teams, normalized[i:i + len(teams)])]
+            i += len(teams)
+            final_data["divisions"][str(n)] = {"teams": team_json, "division_analytics": summary}
+        return json.dumps(final_data, indent=2)
+
+
+class StageTimer:
+    """stage_hook that records wall-clock seconds per stage."""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = time.perf_counter() - start
+
+
+class StageMemory:
+    """stage_hook that records the tracemalloc peak (bytes) per stage."""
+
+    def __init__(self):
+        self.peak = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak[name] = peak - base
+
+
+# =============================================================================
+# STEP 3: RUN & REPORT
+# =============================================================================
+def _summary(samples):
+    return {"best": min(samples), "median": statistics.median(samples), "runs": samples}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_benchmark(data_dir, csv_files, repeat=3):
+    paths = [os.path.join(data_dir, name) for name in csv_files.values()]
+
+    timings = {stage: [] for stage in STAGES + ["total", "end_to_end"]}
+    for _ in range(repeat):
+        timer = StageTimer()
+        run_stages(paths, stage_hook=timer)
+        for stage in STAGES:
+            timings[stage].append(timer.seconds[stage])
+        timings["total"].append(sum(timer.seconds.values()))
+
+        # Whole process_csvs() run (prints suppressed, no build cache)
+        output_path = os.path.join(data_dir, 'out', 'azure_predictions.json')
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_csvs(data_dir, csv_files, output_path, use_cache=False)
+        timings["end_to_end"].append(time.perf_counter() - start)
+
+    memory = StageMemory()
+    tracemalloc.start()
+    try:
+        run_stages(paths, stage_hook=memory)
+        _, overall_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": {stage: _summary(samples) for stage, samples in timings.items()},
+        "peak_memory_bytes": dict(memory.peak, total=overall_peak),
+    }
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the prediction post-processor on a synthetic league.")
+    parser.add_argument('--teams', type=int, default=5, help="Teams per division (default: 5)")
+    parser.add_argument('--seasons', type=int, default=10,
+                        help=f"Seasons per team, ending with {PREDICTION_SEASON} (default: 10)")
+    parser.add_argument('--divisions', type=int, default=6, help="Division CSVs (default: 6)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (default: 3)")
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic data seed (default: 0)")
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help="Write the results JSON here (default: print to stdout)")
+    parser.add_argument('--data-dir', metavar='DIR',
+                        help="Generate the CSVs here and keep them (default: a temp dir)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='oracle_bench_')
+    try:
+        csv_files = generate_league(data_dir, args.teams, args.seasons, args.divisions, args.seed)
+        rows = args.teams * args.seasons * args.divisions
+        print(f"Synthetic league: {args.divisions} divisions × {args.teams} teams × "
+              f"{args.seasons} seasons = {rows} rows", file=sys.stderr)
+        results = run_benchmark(data_dir, csv_files, args.repeat)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"teams": args.teams, "seasons": args.seasons, "divisions": args.divisions,
+                   "rows": rows, "repeat": args.repeat, "seed": args.seed},
+        **results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    for stage in STAGES + ["end_to_end"]:
+        best = report["seconds"][stage]["best"]
+        peak = report["peak_memory_bytes"].get(stage)
+        mem = f"  peak {peak / 1e6:8.2f} MB" if peak is not None else ""
+        print(f"  {stage:18s} {best * 1000:10.2f} ms{mem}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""
+==============================================================================
+NBA ORACLE — Incremental Build Cache
+==============================================================================
+Purpose: Lets process_csvs() skip work for division CSVs that have not
+         changed since the last run.
+
+HOW IT WORKS:
+  - Every input CSV is identified by the SHA-256 of its bytes.
+  - The per-division intermediate result (parsed teams with their history
+    and the division analytics) is stored next to a manifest, with every
+    TeamSeason record as a compact row (records.py):
+
+      .oracle_cache/
+        manifest.json                   ← {division: sha256, ...} + last build info
+        divisions/atlantic.<sha256>.json
+
+  - Division files are named after the hash of the CSV they came from, so a
+    file can never be served for different input. Freshly parsed divisions
+    are only staged by put_division(); save() writes them together with the
+    manifest once the whole build has succeeded, and removes the files the
+    manifest no longer points to.
+
+  - On the next run a division whose hash matches is loaded from the cache
+    instead of being re-parsed.
+  - The "build key" hashes ALL inputs together (plus the scoring config).
+    If it matches the last build and every output file is still the one we
+    wrote, the run stops early and azure_predictions.json is not touched,
+    so downstream uploads see no new file.
+
+Bump CACHE_VERSION whenever the shape of the cached division data changes.
+==============================================================================
+"""
+
+import hashlib
+import json
+import os
+
+from publish import atomic_write, file_sha256  # Re-exported for process_predictions
+from records import TeamSeason
+
+CACHE_VERSION = 4
+MANIFEST_NAME = 'manifest.json'
+
+
+def build_key(source_hashes, *config):
+    """One digest for the union of inputs: [(division, sha256), ...] + config."""
+    payload = json.dumps([CACHE_VERSION, list(source_hashes), list(config)],
+                         sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildCache:
+    """Content-hash manifest plus cached per-division results."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self.pending = {}  # {division: stored result} waiting for save()
+
+    def _load_manifest(self):
+        empty = {"version": CACHE_VERSION, "divisions": {}, "build": None}
+        if not os.path.exists(self.manifest_path):
+            return empty
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return empty  # Corrupt manifest → rebuild everything
+        if manifest.get("version") != CACHE_VERSION:
+            return empty
+        return manifest
+
+    def _division_path(self, div_key, source_hash):
+        return os.path.join(self.cache_dir, 'divisions', f'{div_key}.{source_hash}.json')
+
+    def get_division(self, div_key, source_hash):
+        """Cached result for a division, or None if the CSV changed."""
+        entry = self.manifest["divisions"].get(div_key)
+        if not entry or entry["sha256"] != source_hash:
+            return None
+        try:
+            with open(self._division_path(div_key, source_hash), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            cached["teams"] = [TeamSeason.from_row(row) for row in cached["teams"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cached
+
+    def put_division(self, div_key, source_path, source_hash, result):
+        """Stages a freshly parsed division result; save() writes it."""
+        stored = dict(result, teams=[t.to_row() for t in result["teams"]])
+        self.pending[div_key] = ({"source": source_path, "sha256": source_hash}, stored)
+
+    def is_current(self, key, output_paths):
+        """True if the last build used the same inputs and its outputs are intact."""
+        build = self.manifest.get("build")
+        if not build or build.get("key") != key:
+            return False
+        recorded = build.get("outputs", {})
+        if set(recorded) != set(output_paths):
+            return False
+        for path in output_paths:
+            if not os.path.exists(path) or file_sha256(path) != recorded[path]:
+                return False
+        return True
+
+    def record_build(self, key, output_paths):
+        self.manifest["build"] = {
+            "key": key,
+            "outputs": {path: file_sha256(path) for path in output_paths},
+        }
+
+    def save(self):
+        """Writes the staged divisions, then the manifest that points to them."""
+        divisions = self.manifest["divisions"]
+        replaced = []
+        for div_key, (entry, stored) in self.pending.items():
+            with atomic_write(self._division_path(div_key, entry["sha256"]), encoding='utf-8') as f:
+                json.dump(stored, f, separators=(',', ':'))
+            old = divisions.get(div_key)
+            if old and old["sha256"] != entry["sha256"]:
+                replaced.append(self._division_path(div_key, old["sha256"]))
+            divisions[div_key] = entry
+        self.pending = {}
+        with atomic_write(self.manifest_path, encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        for path in replaced:  # Only once nothing refers to them any more
+            if os.path.exists(path):
+                os.remove(path)
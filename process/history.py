@@ -0,0 +1,151 @@
+"""
+==============================================================================
+NBA ORACLE — Season-Indexed History & Precomputed Trends
+==============================================================================
+Purpose: One store for every team-season, keyed by (team, season), and the
+         trend numbers derived from it, computed ONCE per build.
+
+THE STORE (SeasonIndex):
+  - index.get("Boston Celtics", "2024-25")   → O(1) dict lookup
+  - index.append(team, entry)                → incremental; keeps each
+    team's seasons in order, so nothing is re-sorted per team later
+  - index.series(team)                       → that team's seasons, oldest first
+
+  Entries are HistoryEntry / TeamSeason records (records.py); anything with
+  season, win_pct, off_rating and def_rating works.
+
+THE TRENDS (TeamTrend), for one team-season against its own past:
+
+  yoy        year-over-year change vs the previous season in the store
+               win_pct, off_rating, def_rating, net_rating
+  rolling    average of the last ROLLING_SEASONS seasons (incl. this one)
+  direction  "up" / "down" / "flat": win% change of at least TREND_THRESHOLD
+
+  JSON (the "trend" key of every team in azure_predictions.json):
+    {"previous_season": "2024-25", "direction": "up",
+     "yoy": {"win_pct": 0.08, "off_rating": 1.9, "def_rating": -0.4, "net_rating": 2.3},
+     "rolling": {"seasons": 3, "win_pct": 0.596, "off_rating": 118.4, ...}}
+
+  The oracle match reasoning and the matchup model's momentum term read
+  these values instead of recomputing them from "historical".
+==============================================================================
+"""
+
+from bisect import bisect_left
+
+
+# Seasons averaged in TeamTrend.rolling (the current one included)
+ROLLING_SEASONS = 3
+
+# A year-over-year win% change smaller than this reads as "flat"
+TREND_THRESHOLD = 0.03
+
+TREND_STATS = ('win_pct', 'off_rating', 'def_rating', 'net_rating')
+
+# Decimal places per stat in the JSON (same precision as the dashboard)
+_DIGITS = {'win_pct': 3, 'off_rating': 1, 'def_rating': 1, 'net_rating': 1}
+
+
+def _stat(entry, stat):
+    if stat == 'net_rating':
+        return entry.off_rating - entry.def_rating
+    return getattr(entry, stat)
+
+
+class TeamTrend:
+    """Precomputed trend numbers for one team-season (see module docstring)."""
+
+    __slots__ = ('previous_season', 'previous_win_pct', 'yoy', 'rolling', 'rolling_seasons',
+                 'direction')
+
+    def __init__(self, previous_season, previous_win_pct, yoy, rolling, rolling_seasons,
+                 direction):
+        self.previous_season = previous_season
+        self.previous_win_pct = previous_win_pct
+        self.yoy = yoy            # {stat: delta} or None without a previous season
+        self.rolling = rolling    # {stat: average}
+        self.rolling_seasons = rolling_seasons
+        self.direction = direction
+
+    def to_json(self):
+        return {
+            "previous_season": self.previous_season,
+            "direction": self.direction,
+            "yoy": None if self.yoy is None else
+                   {stat: round(v, _DIGITS[stat]) for stat, v in self.yoy.items()},
+            "rolling": {"seasons": self.rolling_seasons,
+                        **{stat: round(v, _DIGITS[stat]) for stat, v in self.rolling.items()}},
+        }
+
+    def to_row(self):
+        return [self.previous_season, self.previous_win_pct, self.yoy, self.rolling,
+                self.rolling_seasons, self.direction]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+
+class SeasonIndex:
+    """(team, season) → entry, with each team's seasons kept in order."""
+
+    __slots__ = ('_entries', '_seasons', '_series')
+
+    def __init__(self):
+        self._entries = {}  # (team, season) → entry
+        self._seasons = {}  # team → [season, ...] sorted
+        self._series = {}   # team → [entry, ...] aligned with _seasons
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def append(self, team, entry):
+        """Adds (or replaces) one team-season; O(1) when seasons arrive in order."""
+        key = (team, entry.season)
+        seasons = self._seasons.setdefault(team, [])
+        series = self._series.setdefault(team, [])
+        if key in self._entries:
+            series[seasons.index(entry.season)] = entry
+        elif not seasons or entry.season > seasons[-1]:
+            seasons.append(entry.season)
+            series.append(entry)
+        else:
+            pos = bisect_left(seasons, entry.season)
+            seasons.insert(pos, entry.season)
+            series.insert(pos, entry)
+        self._entries[key] = entry
+
+    def get(self, team, season, default=None):
+        return self._entries.get((team, season), default)
+
+    def series(self, team):
+        """Every stored season of one team, oldest first."""
+        return tuple(self._series.get(team, ()))
+
+    def trend(self, team, season):
+        """TeamTrend for one stored team-season against the seasons before it."""
+        seasons = self._seasons[team]
+        pos = bisect_left(seasons, season)
+        series = self._series[team]
+        current = series[pos]
+
+        previous = series[pos - 1] if pos else None
+        yoy = None
+        direction = "flat"
+        if previous is not None:
+            yoy = {stat: _stat(current, stat) - _stat(previous, stat) for stat in TREND_STATS}
+            if yoy['win_pct'] >= TREND_THRESHOLD:
+                direction = "up"
+            elif yoy['win_pct'] <= -TREND_THRESHOLD:
+                direction = "down"
+
+        window = series[max(0, pos + 1 - ROLLING_SEASONS):pos + 1]
+        rolling = {stat: sum(_stat(e, stat) for e in window) / len(window) for stat in TREND_STATS}
+
+        return TeamTrend(
+            previous.season if previous is not None else None,
+            previous.win_pct if previous is not None else None,
+            yoy, rolling, len(window), direction)
@@ -0,0 +1,113 @@
+"""
+==============================================================================
+NBA ORACLE — Run Instrumentation (spans, counters, trace output)
+==============================================================================
+Purpose: Shows where a process_csvs() run spends its time without printing
+         one line per team. Everything here is OFF by default.
+
+SPANS:
+  Named, nestable timings around each STEP:
+
+      with tracer.span("STEP 4: bounds"):
+          ...
+
+COUNTERS:
+  Running totals for the run (rows_read, teams_scored, bytes_written, ...):
+
+      tracer.count("rows_read", 1230)
+
+TRACE FILE (process_predictions.py --profile trace.json):
+  Chrome trace-event JSON: open it in chrome://tracing or ui.perfetto.dev,
+  or read "spans" / "counters" directly:
+
+      {"traceEvents": [{"name": "STEP 4: bounds", "ph": "X", "ts": 1520.3,
+                        "dur": 41.7, "pid": 1, "tid": 1, "args": {}}, ...],
+       "spans": [{"name": ..., "depth": 0, "seconds": ...}, ...],
+       "counters": {"rows_read": 1230, ...}}
+
+  --cprofile FILE additionally writes cProfile stats for the whole run
+  (pstats format; snakeviz / flameprof / gprof2dot turn it into a graph).
+
+LOGGING:
+  The pipeline logs through the standard "logging" module. configure_logging()
+  keeps it at WARNING unless -v (INFO) or -vv (DEBUG, per-team scores) is given.
+==============================================================================
+"""
+
+import contextlib
+import json
+import logging
+import os
+import time
+
+
+LOG_FORMAT = '%(levelname)s %(name)s: %(message)s'
+
+
+def configure_logging(verbosity=0):
+    """0 → WARNING (default), 1 → INFO, 2+ → DEBUG."""
+    level = logging.WARNING if verbosity <= 0 else logging.INFO if verbosity == 1 else logging.DEBUG
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+class Tracer:
+    """Collects spans and counters for one run; spans are no-ops when disabled."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.counters = {}
+        self.spans = []   # [(name, depth, start, end, attrs)] in completion order
+        self._depth = 0
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        if not self.enabled:
+            yield
+            return
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.spans.append((name, depth, start, time.perf_counter(), attrs))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def count_file(self, path, name='bytes_written'):
+        """Adds a just-written file's size to a byte counter."""
+        try:
+            self.count(name, os.path.getsize(path))
+        except OSError:
+            pass
+
+    def to_dict(self):
+        """Chrome trace-event JSON plus flat "spans" / "counters" summaries."""
+        us = 1e6
+        ordered = sorted(self.spans, key=lambda s: (s[2], s[1]))
+        events = [
+            {"name": name, "ph": "X", "ts": round((start - self._origin) * us, 1),
+             "dur": round((end - start) * us, 1), "pid": 1, "tid": 1, "args": attrs}
+            for name, depth, start, end, attrs in ordered
+        ]
+        end = max((s[3] for s in self.spans), default=self._origin)
+        events += [
+            {"name": name, "ph": "C", "ts": round((end - self._origin) * us, 1),
+             "pid": 1, "tid": 1, "args": {name: value}}
+            for name, value in self.counters.items()
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "spans": [{"name": name, "depth": depth, "seconds": end - start, **attrs}
+                      for name, depth, start, end, attrs in ordered],
+            "counters": dict(self.counters),
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
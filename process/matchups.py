@@ -0,0 +1,156 @@
+"""
+==============================================================================
+NBA ORACLE — All-Pairs Head-to-Head Matchup Matrix
+==============================================================================
+Purpose: Precomputes the home win probability and confidence for EVERY
+         possible home/away pairing, so any scheduled (or hypothetical)
+         game is a single lookup instead of per-pair Python work.
+
+THE MODEL (see "MATCH PREDICTION" in process_predictions.py):
+
+  1. Base chance — the win-percentage ratio:
+       base = home_win_pct / (home_win_pct + away_win_pct)
+
+  2. Layered adjustments (weights in MatchupWeights):
+       + proba      × (home 1_predicted_proba − away 1_predicted_proba)
+       + net_rating × (home net rating − away net rating)
+       + trend      × (home trend − away trend)
+         trend = current win% − last season's win% (year-over-year momentum)
+       + home_court                     (~2.5 confidence points for the host)
+
+  3. Clamp to [0.01, 0.99]; the away team gets 1 − home.
+       confidence = |home − away| × 100
+
+  Every adjustment except home court is "team value minus opponent value",
+  so it collapses to one strength number per team:
+
+       strength[i] = proba × p[i] + net_rating × net[i] + trend × trend[i]
+       home_prob[i][j] = base[i][j] + strength[i] − strength[j] + home_court
+
+  That is what makes the full N×N matrix one cheap pass per row.
+
+ARTIFACT (compact JSON, written next to azure_predictions.json):
+
+  {"meta": {...}, "ids": ["BOS", ...], "names": [...],
+   "home_win_prob": [[null, 0.549, ...], ...],   ← row = home, column = away
+   "confidence":    [[null, 9.8, ...], ...]}
+==============================================================================
+"""
+
+import json
+from collections import namedtuple
+
+from publish import atomic_write
+from teams import TeamIdCollision, unique_team_ids
+
+
+MatchupWeights = namedtuple('MatchupWeights', ['proba', 'net_rating', 'trend', 'home_court'])
+
+# proba:      0.05 per 100% gap in Azure ML playoff probability
+# net_rating: 0.005 per point of net rating (10-pt gap → +5%)
+# trend:      0.10 per 1.000 of year-over-year win% change
+# home_court: 0.0125 → +2.5 points of confidence for the home team
+DEFAULT_MATCHUP_WEIGHTS = MatchupWeights(proba=0.05, net_rating=0.005, trend=0.10, home_court=0.0125)
+
+MIN_PROB = 0.01
+MAX_PROB = 0.99
+
+
+def team_trend(team):
+    """Current win% minus last season's win% (0.0 when there is no history)."""
+    if team.trend is None or team.trend.yoy is None:
+        return 0.0
+    return team.trend.yoy['win_pct']
+
+
+def matchup_inputs(teams):
+    """
+    Columns the engine needs, pulled from TeamSeason records (records.py).
+    """
+    names = [t.team for t in teams]
+    return {
+        "ids": unique_team_ids(names),  # Lookup keys: a duplicate would shadow a team
+        "names": names,
+        "win_pct": [t.win_pct for t in teams],
+        "proba": [t.proba for t in teams],
+        "net_rating": [t.net_rating for t in teams],
+        "trend": [team_trend(t) for t in teams],
+    }
+
+
+def home_win_matrix(inputs, weights=DEFAULT_MATCHUP_WEIGHTS):
+    """N×N home win probabilities (row = home, column = away, diagonal None)."""
+    win = inputs['win_pct']
+    strength = [
+        weights.proba * p + weights.net_rating * n + weights.trend * tr
+        for p, n, tr in zip(inputs['proba'], inputs['net_rating'], inputs['trend'])
+    ]
+    hca = weights.home_court
+
+    matrix = []
+    for i, (w_home, s_home) in enumerate(zip(win, strength)):
+        offset = s_home + hca
+        row = [
+            min(MAX_PROB, max(MIN_PROB,
+                (w_home / (w_home + w_away) if w_home + w_away else 0.5) + offset - s_away))
+            for w_away, s_away in zip(win, strength)
+        ]
+        row[i] = None  # A team never plays itself
+        matrix.append(row)
+    return matrix
+
+
+def matchup_artifact(inputs, matrix, weights=DEFAULT_MATCHUP_WEIGHTS):
+    """Rounds an already computed home_win_matrix() into the JSON artifact."""
+    return {
+        "meta": {"weights": weights._asdict(), "row": "home", "column": "away"},
+        "ids": inputs['ids'],
+        "names": inputs['names'],
+        "home_win_prob": [[None if p is None else round(p, 3) for p in row] for row in matrix],
+        "confidence": [[None if p is None else round(abs(2 * p - 1) * 100, 1) for p in row]
+                       for row in matrix],
+    }
+
+
+def write_matchup_matrix(matrix, path):
+    with atomic_write(path, encoding='utf-8') as f:
+        json.dump(matrix, f, separators=(',', ':'))
+
+
+class MatchupMatrix:
+    """O(1) home/away lookups into a built (or loaded) matchup artifact."""
+
+    def __init__(self, data):
+        self.data = data
+        self.index = {}
+        for i, (tid, name) in enumerate(zip(data['ids'], data['names'])):
+            for key in (tid, name):
+                other = self.index.setdefault(key, i)
+                if other != i:
+                    raise TeamIdCollision(f"{key!r} names both {data['names'][other]!r} "
+                                          f"and {name!r} in the matchup matrix")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def lookup(self, home, away):
+        """Prediction for one game; home/away may be IDs or full names."""
+        try:
+            i, j = self.index[home], self.index[away]
+        except KeyError as exc:
+            raise KeyError(f"Unknown team: {exc.args[0]}") from None
+        if i == j:
+            raise ValueError(f"{home} cannot play itself")
+
+        home_prob = self.data['home_win_prob'][i][j]
+        home_id, away_id = self.data['ids'][i], self.data['ids'][j]
+        return {
+            "home": home_id,
+            "away": away_id,
+            "home_win_prob": home_prob,
+            "away_win_prob": round(1 - home_prob, 3),
+            "projected_winner": home_id if home_prob >= 0.5 else away_id,
+            "confidence": self.data['confidence'][i][j],
+        }
@@ -0,0 +1,181 @@
+"""
+==============================================================================
+NBA ORACLE — Simplified Dashboard Payload (azure_oracle_prediction.json)
+==============================================================================
+Purpose: Builds the flat "teams" + "matches" JSON that the match cards use,
+         from the SAME in-memory team model that produces
+         azure_predictions.json. This replaces the separate Node.js pass
+         (process_predictions.js), so both files come from one parse.
+
+TEAMS:
+  {"id": "BOS", "name": "Boston Celtics", "win_prob": 0.642,
+   "off_rtg": 120.0, "def_rtg": 112.7, "conf": "East"}
+
+MATCHES:
+  Winner and confidence come from the all-pairs matchup matrix
+  (matchups.py), so they include the playoff-probability, net-rating,
+  trend and home-court layers. The "reasoning" array follows the AI
+  Analysis format described in the README:
+
+    1. ML Playoff Prob     4. Defense
+    2. Net Rating          5. <last season> Trend
+    3. Offense             6. Home court / road favorite note
+==============================================================================
+"""
+
+import json
+import logging
+
+from matchups import MatchupMatrix
+from teams import team_id, unique_team_ids
+
+
+# Conference groupings used by the dashboard ("East" / "West")
+CONF_SHORT = {"Eastern": "East", "Western": "West"}
+
+# Tonight's slate (Feb 19, 2026 ET / Feb 20, 2026 PHT) — same games as the
+# Node.js script. Override with process_predictions.py --schedule FILE.
+SCHEDULE_DATE = "2026-02-19"
+SCHEDULE_DATE_PHT = "2026-02-20"
+SCHEDULE = [
+    {"away": "Brooklyn Nets", "home": "Cleveland Cavaliers", "time": "7:00 PM", "venue": "Rocket Mortgage FieldHouse"},
+    {"away": "Detroit Pistons", "home": "New York Knicks", "time": "7:30 PM", "venue": "Madison Square Garden"},
+    {"away": "Atlanta Hawks", "home": "Philadelphia 76ers", "time": "7:00 PM", "venue": "Wells Fargo Center"},
+    {"away": "Houston Rockets", "home": "Charlotte Hornets", "time": "7:00 PM", "venue": "Spectrum Center"},
+    {"away": "Indiana Pacers", "home": "Washington Wizards", "time": "7:00 PM", "venue": "Capital One Arena"},
+    {"away": "Toronto Raptors", "home": "Chicago Bulls", "time": "8:00 PM", "venue": "United Center"},
+    {"away": "Phoenix Suns", "home": "San Antonio Spurs", "time": "8:30 PM", "venue": "Moody Center (Austin)"},
+    {"away": "Boston Celtics", "home": "Golden State Warriors", "time": "10:00 PM", "venue": "Chase Center"},
+    {"away": "Orlando Magic", "home": "Sacramento Kings", "time": "10:00 PM", "venue": "Golden 1 Center"},
+    {"away": "Denver Nuggets", "home": "LA Clippers", "time": "10:30 PM", "venue": "Intuit Dome"}
+]
+
+log = logging.getLogger('oracle_output')
+
+
+def load_schedule(path):
+    """Reads a schedule JSON file: [{"away", "home", "time", "venue", ...}, ...]."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _wp(value):
+    """0.78 → ".780" (win percentage the way the dashboard prints it)."""
+    text = f"{value:.3f}"
+    return text[1:] if text.startswith("0") else text
+
+
+def _pct(prob):
+    """Playoff probability as a percentage: 0.951 → "95.1%", 2.7e-05 → "0.003%"."""
+    value = prob * 100
+    if value < 1:
+        return f"{value:.3f}%"
+    if 99.95 <= value < 100:
+        return f"{min(value, 99.99):.2f}%"  # Don't round a near-lock up to "100.0%"
+    return f"{value:.1f}%"
+
+
+def _trend_text(team):
+    """Reads the precomputed TeamTrend (history.py) instead of the raw history."""
+    trend = team.trend
+    current = team.win_pct
+    if trend is None or trend.yoy is None:
+        return f"at {_wp(current)}"
+    previous = trend.previous_win_pct
+    if trend.direction == "up":
+        return f"surging from {_wp(previous)} to {_wp(current)}"
+    if trend.direction == "down":
+        return f"slipping {_wp(previous)} to {_wp(current)}"
+    return f"consistent at {_wp(current)}"
+
+
+def match_reasoning(winner, loser, home, venue):
+    """The AI Analysis bullet list for one game (winner's perspective)."""
+    w, l = team_id(winner.team), team_id(loser.team)
+
+    lines = [f"ML Playoff Prob: {w} {_pct(winner.proba)} vs {l} {_pct(loser.proba)}"]
+
+    net_w, net_l = winner.net_rating, loser.net_rating
+    lines.append(f"Net Rating: {w} {net_w:+.1f} vs {l} {net_l:+.1f} (gap of {abs(net_w - net_l):.1f})")
+
+    off_diff = winner.off_rating - loser.off_rating
+    edge = f"+{off_diff:.1f} edge" if off_diff >= 0 else f"{l} +{-off_diff:.1f} edge"
+    lines.append(f"Offense: {w} {winner.off_rating:.1f} vs {l} {loser.off_rating:.1f} ({edge})")
+
+    if winner.def_rating == loser.def_rating:
+        stingier = "even"
+    else:
+        stingier = f"{w if winner.def_rating < loser.def_rating else l} allows fewer pts"
+    lines.append(f"Defense: {w} {winner.def_rating:.1f} vs {l} {loser.def_rating:.1f} ({stingier})")
+
+    if winner.trend is not None and winner.trend.previous_season:
+        last_season = winner.trend.previous_season
+        lines.append(f"{last_season} Trend: {w} {_trend_text(winner)}; {l} {_trend_text(loser)}")
+
+    if venue:
+        if home is winner:
+            lines.append(f"Home Court: {w} at {venue}")
+        else:
+            lines.append(f"Note: {w} favored on the road at {venue}")
+    return lines
+
+
+def build_oracle_payload(teams, conferences, matchup_matrix, schedule=SCHEDULE,
+                         last_updated=SCHEDULE_DATE, date=SCHEDULE_DATE, date_pht=SCHEDULE_DATE_PHT):
+    """
+    azure_oracle_prediction.json from process_csvs() team objects.
+
+    teams:          TeamSeason records (records.py)
+    conferences:    conference name per team ("Eastern" / "Western")
+    matchup_matrix: matchup artifact dict (matchups.matchup_artifact)
+    """
+    payload = {
+        "oracle_metadata": {
+            "model": "Azure ML VotingEnsemble (LightGBM + XGBoost)",
+            "last_updated": last_updated,
+            "global_accuracy": "0.9850"  # 98.5% model accuracy from Azure ML evaluation
+        },
+        "teams": [],
+        "matches": []
+    }
+
+    # Match "stats" are keyed by ID, so every team needs its own
+    ids = dict(zip((t.team for t in teams), unique_team_ids([t.team for t in teams])))
+    by_name = {}
+    for team, conf in zip(teams, conferences):
+        by_name[team.team] = team
+        payload["teams"].append({
+            "id": ids[team.team],
+            "name": team.team,
+            "win_prob": round(team.win_pct, 3),
+            "off_rtg": round(team.off_rating, 1),
+            "def_rtg": round(team.def_rating, 1),
+            "conf": CONF_SHORT.get(conf, conf)
+        })
+
+    lookup = MatchupMatrix(matchup_matrix)
+    for game in schedule:
+        away, home = by_name.get(game['away']), by_name.get(game['home'])
+        if away is None or home is None:
+            log.warning("Skipping %s vs %s — team not in prediction data", game['away'], game['home'])
+            continue
+
+        result = lookup.lookup(home.team, away.team)
+        winner, loser = (home, away) if result['projected_winner'] == result['home'] else (away, home)
+        away_id, home_id = ids[away.team], ids[home.team]
+        payload["matches"].append({
+            "date": game.get('date', date),
+            "date_pht": game.get('date_pht', date_pht),
+            "teams": [away.team, home.team],
+            "ids": [away_id, home_id],
+            "stats": {
+                away_id: {"off": away.off_rating, "def": away.def_rating},
+                home_id: {"off": home.off_rating, "def": home.def_rating}
+            },
+            "time": game.get('time', ''),
+            "venue": game.get('venue', ''),
+            "projected_winner": result['projected_winner'],
+            "confidence": result['confidence'],
+            "reasoning": match_reasoning(winner, loser, home, game.get('venue', ''))
+        })
+    return payload
@@ -0,0 +1,190 @@
+"""
+==============================================================================
+NBA ORACLE — Columnar Loader for Azure ML Prediction CSVs
+==============================================================================
+Purpose: Parses one Azure ML prediction CSV ONCE into typed, column-oriented
+         arrays that every later step of the post-processor reads from.
+
+WHY COLUMNAR?
+  - csv.DictReader builds one dict per row and keeps every cell as a string,
+    so the same "120.0" gets converted with float() again and again.
+  - Here every numeric cell is converted exactly once and stored in a compact
+    array('d') / array('b') column. Strings (season, team) are interned so
+    "2025-26" is stored once no matter how many rows mention it.
+
+SCHEMA:
+  The header is checked before any row is read. A missing column raises
+  PredictionSchemaError naming the file and the columns that are missing,
+  instead of a KeyError halfway through the file. check_header() is shared
+  with other loaders (season_data.py), which pass their own schema and
+  SchemaError subclass.
+
+    Column                 →  Attribute        Type
+    Season_orig            →  season           str (interned)
+    Team_orig              →  team             str (interned)
+    Win_Pct_orig           →  win_pct          array('d')
+    Off_Rating_orig        →  off_rating       array('d')
+    Def_Rating_orig        →  def_rating       array('d')
+    1_predicted_proba      →  predicted_proba  array('d')
+    MadePlayoffs_orig      →  made_playoffs    array('b')  (1 / 0)
+
+  Extra columns (ThreeP_Pct_orig, TS%_orig, ...) are ignored.
+
+BOUNDS-ONLY SCAN (streaming mode, pass one):
+  scan_prediction_bounds() reads a file row by row and keeps only a running
+  min/max per stat for one season — no columns are stored, so its memory
+  does not grow with the file.
+==============================================================================
+"""
+
+import csv
+import sys
+from array import array
+
+
+# Required CSV column → attribute name on PredictionColumns
+PREDICTION_SCHEMA = {
+    'Season_orig': 'season',
+    'Team_orig': 'team',
+    'Win_Pct_orig': 'win_pct',
+    'Off_Rating_orig': 'off_rating',
+    'Def_Rating_orig': 'def_rating',
+    '1_predicted_proba': 'predicted_proba',
+    'MadePlayoffs_orig': 'made_playoffs',
+}
+
+
+class SchemaError(ValueError):
+    """Raised when an input file is missing required columns or has an unreadable row."""
+
+
+class PredictionSchemaError(SchemaError):
+    """Raised when a prediction CSV is missing required columns or has an unreadable row."""
+
+
+class PredictionColumns:
+    """Typed column store for the rows of one Azure ML prediction CSV."""
+
+    __slots__ = ('source', 'season', 'team', 'win_pct', 'off_rating',
+                 'def_rating', 'predicted_proba', 'made_playoffs')
+
+    def __init__(self, source=None):
+        self.source = source
+        self.season = []
+        self.team = []
+        self.win_pct = array('d')
+        self.off_rating = array('d')
+        self.def_rating = array('d')
+        self.predicted_proba = array('d')
+        self.made_playoffs = array('b')
+
+    def __len__(self):
+        return len(self.team)
+
+    def split_season(self, season):
+        """Returns (current_indices, historical_indices) for one season."""
+        current, historical = [], []
+        for i, s in enumerate(self.season):
+            (current if s == season else historical).append(i)
+        return current, historical
+
+
+def check_header(header, source=None, schema=PREDICTION_SCHEMA, error=PredictionSchemaError):
+    """Maps every required column of schema to its position in the header row."""
+    positions = {name: i for i, name in enumerate(header)}
+    missing = [col for col in schema if col not in positions]
+    if missing:
+        raise error(
+            f"{source or 'CSV'} is missing required columns: {', '.join(missing)}"
+        )
+    return {col: positions[col] for col in schema}
+
+
+def load_prediction_csv(filepath):
+    """Reads one prediction CSV into a PredictionColumns store."""
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        return parse_prediction_rows(csv.reader(f), source=filepath)
+
+
+def parse_prediction_rows(reader, source=None):
+    """Parses an iterator of CSV rows (header first) into typed columns."""
+    header = next(reader, None)
+    if header is None:
+        raise PredictionSchemaError(f"{source or 'CSV'} is empty")
+    idx = check_header(header, source)
+
+    i_season = idx['Season_orig']
+    i_team = idx['Team_orig']
+    i_win = idx['Win_Pct_orig']
+    i_off = idx['Off_Rating_orig']
+    i_def = idx['Def_Rating_orig']
+    i_prob = idx['1_predicted_proba']
+    i_made = idx['MadePlayoffs_orig']
+
+    cols = PredictionColumns(source)
+    intern = sys.intern
+    seasons, teams = cols.season, cols.team
+    win, off, dfn = cols.win_pct.append, cols.off_rating.append, cols.def_rating.append
+    prob, made = cols.predicted_proba.append, cols.made_playoffs.append
+
+    for line_no, row in enumerate(reader, start=2):
+        if not row:
+            continue  # Skip blank lines (trailing newline in Azure exports)
+        try:
+            win(float(row[i_win]))
+            off(float(row[i_off]))
+            dfn(float(row[i_def]))
+            prob(float(row[i_prob]))
+            made(1 if int(row[i_made]) == 1 else 0)
+        except (ValueError, IndexError) as exc:
+            raise PredictionSchemaError(
+                f"{source or 'CSV'} line {line_no}: {exc}"
+            ) from exc
+        seasons.append(intern(row[i_season]))
+        teams.append(intern(row[i_team]))
+
+    return cols
+
+
+def scan_prediction_bounds(filepath, season, stats):
+    """
+    {stat: (min, max)} over the rows of one season, without storing rows.
+
+    stats are PredictionColumns attribute names (e.g. "off_rating"). Returns
+    ({} if the season has no rows, rows read). Values are parsed exactly as
+    parse_prediction_rows() does, so the bounds match a full load.
+    """
+    columns = {attr: col for col, attr in PREDICTION_SCHEMA.items()}
+    unknown = [s for s in stats if s not in columns]
+    if unknown:
+        raise ValueError(f"Cannot scan bounds for: {', '.join(unknown)}")
+
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise PredictionSchemaError(f"{filepath} is empty")
+        idx = check_header(header, filepath)
+        i_season = idx['Season_orig']
+        positions = [(stat, idx[columns[stat]]) for stat in stats]
+
+        lows, highs = {}, {}
+        rows = 0
+        for line_no, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            rows += 1
+            if row[i_season] != season:
+                continue
+            for stat, i in positions:
+                try:
+                    value = float(row[i])
+                except (ValueError, IndexError) as exc:
+                    raise PredictionSchemaError(f"{filepath} line {line_no}: {exc}") from exc
+                if stat not in lows:
+                    lows[stat] = highs[stat] = value
+                elif value < lows[stat]:
+                    lows[stat] = value
+                elif value > highs[stat]:
+                    highs[stat] = value
+    return {stat: (lows[stat], highs[stat]) for stat in lows}, rows
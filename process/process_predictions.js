@@ -6,6 +6,10 @@
  * Purpose: Reads Azure ML prediction CSV files, extracts 2025-26 season data,
  *          and generates a simplified JSON for the NBA Oracle web dashboard.
  *
+ * NOTE: process_predictions.py now writes azure_oracle_prediction.json in the
+ *       same run as azure_predictions.json. This script is no longer part of
+ *       the build and is kept for reference.
+ *
  * ==============================================================================
  * AZURE ML MODEL: VotingEnsemble (LightGBM + XGBoost)
  * ==============================================================================
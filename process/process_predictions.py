@@ -5,6 +5,8 @@ NBA ORACLE — Azure ML Prediction Post-Processor
 Subject: Cloud Computing (Defense: February 19, 2026)
 Purpose: Takes raw Azure ML prediction CSV outputs and transforms them into
          a structured JSON file for the NBA Oracle web dashboard.
+         The same run also writes azure_oracle_prediction.json (teams +
+         match cards), so both dashboard files come from one parse.
 
 ==============================================================================
 AZURE ML MODEL: VotingEnsemble (LightGBM + XGBoost)
@@ -128,20 +130,52 @@ CORE CONCEPTS — POST-PROCESSING CALCULATIONS:
      - Net Rating differential (Off - Def for each team)
      - 2024-25 historical trend (year-over-year trajectory)
      - Home court adjustment (~2-3 pts, lowers road favorite confidence)
+   
+   matchups.py precomputes this model for EVERY home/away pairing at once and
+   writes it to matchup_matrix.json, so a scheduled game is a single lookup.
+
+5. PLAYOFF ODDS (Monte Carlo, optional: --simulations N)
+   - simulate.py plays the remaining schedule and a seeded playoff bracket
+     (with play-in) N times using the matchup probabilities above, and adds
+     seed / playoff / conference-finals / finals / title odds per team.
 
 ==============================================================================
 """
 
-import csv
+import argparse
+import cProfile
+import glob
 import json
+import logging
 import os
-from collections import defaultdict
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from build_cache import BuildCache, build_key, file_sha256
+from instrument import Tracer, configure_logging
+from matchups import (DEFAULT_MATCHUP_WEIGHTS, home_win_matrix, matchup_artifact, matchup_inputs,
+                      write_matchup_matrix)
+from oracle_output import SCHEDULE, build_oracle_payload, load_schedule
+from prediction_columns import load_prediction_csv, scan_prediction_bounds
+from history import SeasonIndex
+from publish import atomic_write
+from records import HistoryEntry, TeamSeason
+from scoring import (DEFAULT_SCORE_SPECS, compute_bounds, merge_bounds, rounded_scores,
+                     score_columns, stat_columns, with_weights)
+from shards import MANIFEST_NAME as SHARD_MANIFEST, write_sharded_output
+from simulate import SEASON_GAMES, SimulationError, simulate_season
+from teams import TeamIdCollision
+from streaming import StreamedObject, write_json_stream, write_ndjson_stream
+from watch import try_build, watch
+
+
+log = logging.getLogger('process_predictions')
 
 
 # =============================================================================
-# STEP 1: MIN-MAX NORMALIZATION FUNCTION
+# STEP 1: MIN-MAX NORMALIZATION (scoring.normalize_column)
 # =============================================================================
-# This function takes a raw value and scales it to a 0-100 range.
+# Every scored stat is scaled to a 0-100 range, one whole column at a time.
 #
 # HOW IT WORKS:
 #   - Subtract the minimum value (shifts the range to start at 0)
@@ -149,62 +183,75 @@ from collections import defaultdict
 #   - Multiply by 100 to get a percentage (0-100 scale)
 #
 # EDGE CASE: If all teams have the same value (max == min), division by zero
-#            would occur, so we return 50 (middle score) as a safe default.
+#            would occur, so every team gets 50 (middle score) instead.
 #
-# EXAMPLE:
-#   normalize(115.0, 110.0, 121.0)
+# EXAMPLE: value 115.0 with min 110.0, max 121.0
 #   = ((115.0 - 110.0) / (121.0 - 110.0)) × 100
 #   = (5.0 / 11.0) × 100
 #   = 45.45
 # =============================================================================
-def normalize(value, min_val, max_val):
-    """Min-Max Normalization: Scales a value to 0-100 range."""
-    if max_val == min_val:
-        return 50  # All teams are equal → default to midpoint
-    return ((value - min_val) / (max_val - min_val)) * 100
 
 
-def process_csvs():
-    # ==========================================================================
-    # STEP 2: CONFIGURATION — File paths & division-to-CSV mapping
-    # ==========================================================================
-    # Each CSV file was generated by Azure ML AutoML. One per NBA division.
-    # The Azure ML model was trained on 2016-2025 NBA season data and
-    # predicts the 2025-26 season outcomes.
-    # ==========================================================================
-    azure_folder = 'c:/Users/Vince/Downloads/NBA-Oracle/csvnba/azure_predictions'
-    csv_files = {
-        'atlantic': 'atlanticpredictions.csv',
-        'central': 'central-division_predictions.csv',
-        'southeast': 'southeast_predictions.csv',
-        'northwest': 'northwest_predictions.csv',
-        'pacific': 'pacific_predictions.csv',
-        'southwest': 'southwest_predictions.csv'
-    }
+# =============================================================================
+# STEP 2: CONFIGURATION — File paths & division-to-CSV mapping
+# =============================================================================
+# Each CSV file was generated by Azure ML AutoML. One per NBA division.
+# The Azure ML model was trained on 2016-2025 NBA season data and
+# predicts the 2025-26 season outcomes.
+#
+# Defaults are relative to the repository so the script runs the same on
+# any machine; every path can be overridden from the command line (main()).
+# =============================================================================
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AZURE_FOLDER = os.path.join(REPO_ROOT, 'csvnba', 'azure_predictions')
+CSV_FILES = {
+    'atlantic': 'atlanticpredictions.csv',
+    'central': 'central-division_predictions.csv',
+    'southeast': 'southeast_predictions.csv',
+    'northwest': 'northwest_predictions.csv',
+    'pacific': 'pacific_predictions.csv',
+    'southwest': 'southwest_predictions.csv'
+}
+OUTPUT_PATH = os.path.join(REPO_ROOT, 'azure_predictions', 'azure_predictions.json')
+
+# The season the Azure ML model is predicting (everything else is history)
+PREDICTION_SEASON = '2025-26'
+
+# Eastern Conference: Atlantic, Central, Southeast
+# Western Conference: Northwest, Pacific, Southwest
+EASTERN_DIVISIONS = ['atlantic', 'central', 'southeast']
 
-    # Output JSON structure — this is what the web dashboard reads
-    final_data = {
-        "meta": {
-            "model": "Azure ML VotingEnsemble (LightGBM + XGBoost)",
-            "version": "2.1",
-            "last_updated": "2026-02-19",
-            # These are the seasons used as TRAINING DATA for the ML model
-            "dataset_seasons": [
-                "2016-17", "2017-18", "2018-19", "2019-20", "2020-21",
-                "2021-22", "2022-23", "2023-24", "2024-25", "2025-26"
-            ],
-            "prediction_target": "2025-26"
-        },
-        "divisions": {}
-    }
 
-    division_teams = defaultdict(list)  # Groups teams by division
-    all_teams_data = []                 # Flat list of ALL teams (for global min/max)
+def division_conference(div_key):
+    """Conference name for a division key ("Eastern" / "Western")."""
+    return "Eastern" if div_key in EASTERN_DIVISIONS else "Western"
 
+
+def resolve_sources(azure_folder=AZURE_FOLDER, csv_files=CSV_FILES):
+    """[(div_key, filepath)] in csv_files order; missing files are skipped with a warning."""
+    sources = []
+    for div_key, filename in csv_files.items():
+        filepath = os.path.join(azure_folder, filename)
+        if not os.path.exists(filepath):
+            log.warning("File not found: %s", filepath)
+            continue
+        sources.append((div_key, filepath))
+    return sources
+
+
+def build_division(filepath):
+    """
+    STEP 3 + 5a for ONE division CSV.
+
+    Returns {"teams": [TeamSeason, ...], "division_analytics": {...}, "rows": N}
+    with the teams sorted by Azure ML playoff probability (best first).
+    Normalized scores are NOT included — they depend on every division
+    (global bounds) and are computed in STEP 5.
+    """
     # ==========================================================================
-    # STEP 3: READ & PARSE ALL CSV FILES
+    # STEP 3: READ & PARSE THE CSV FILE
     # ==========================================================================
-    # We loop through each division's CSV file and extract:
+    # From each division's CSV file we extract:
     #   - Current season (2025-26) data: The ML predictions for this season
     #   - Historical data: Past seasons for trend analysis
     #
@@ -215,89 +262,266 @@ def process_csvs():
     #   - Off_Rating_orig:   Offensive Rating (points scored per 100 possessions)
     #   - Def_Rating_orig:   Defensive Rating (points ALLOWED per 100 possessions)
     #   - 1_predicted_proba: Azure ML's predicted probability of making playoffs
-    #   - MadePlayoffs_predicted: Binary prediction (1 = makes playoffs, 0 = no)
+    #   - MadePlayoffs_orig: Whether the team actually made the playoffs (1/0)
+    #
+    # A file whose header is missing any of these columns is rejected up front
+    # with a PredictionSchemaError (see prediction_columns.py).
     # ==========================================================================
-    for div_key, filename in csv_files.items():
-        filepath = os.path.join(azure_folder, filename)
-        if not os.path.exists(filepath):
-            print(f"File not found: {filepath}")
-            continue
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-            # Determine conference based on division
-            # Eastern Conference: Atlantic, Central, Southeast
-            # Western Conference: Northwest, Pacific, Southwest
-            conf = "Eastern" if div_key in ['atlantic', 'central', 'southeast'] else "Western"
-
-            # Separate current season predictions from historical data
-            current_season_rows = [r for r in rows if r['Season_orig'] == '2025-26']
-            historical_rows = [r for r in rows if r['Season_orig'] != '2025-26']
-
-            # =====================================================================
-            # STEP 3a: Build Historical Data (for trend charts on the dashboard)
-            # =====================================================================
-            history_by_team = defaultdict(list)
-            for h in historical_rows:
-                history_by_team[h['Team_orig']].append({
-                    "season": h['Season_orig'],
-                    "win_pct": float(h.get('Win_Pct_orig', 0)),
-                    "off_rating": float(h.get('Off_Rating_orig', 0)),
-                    "def_rating": float(h.get('Def_Rating_orig', 0)),
-                    "made_playoffs": int(h.get('MadePlayoffs_orig', 0)) == 1
-                })
-
-            # =====================================================================
-            # STEP 3b: Process Current Season (2025-26) Predictions
-            # =====================================================================
-            for row in current_season_rows:
-                team_name = row['Team_orig']
-
-                # Azure ML gives us a probability (0.0 - 1.0) of making playoffs
-                # This is the key ML output: "1_predicted_proba"
-                prob_made_playoffs = float(row.get('1_predicted_proba', 0))
-
-                # ============================================================
-                # PLAYOFF STATUS CLASSIFICATION
-                # ============================================================
-                # We classify teams into 3 tiers based on Azure ML probability:
-                #   > 0.8 (80%+)   → "clinched"   (Almost certainly in playoffs)
-                #   < 0.2 (20%-)   → "eliminated"  (Almost certainly out)
-                #   0.2 to 0.8     → "contender"   (Still in the race)
-                # ============================================================
-                if prob_made_playoffs > 0.8:
-                    status = "clinched"
-                elif prob_made_playoffs < 0.2:
-                    status = "eliminated"
-                else:
-                    status = "contender"
-
-                # Collect the key stats from the CSV
-                stats = {
-                    "win_pct": float(row.get('Win_Pct_orig', 0)),
-                    "off_rating": float(row.get('Off_Rating_orig', 0)),
-                    "def_rating": float(row.get('Def_Rating_orig', 0)),
-                    # Net Rating = Offense - Defense
-                    # Positive = you score more than you allow (GOOD)
-                    # Negative = you allow more than you score (BAD)
-                    "net_rating": round(
-                        float(row.get('Off_Rating_orig', 0)) - float(row.get('Def_Rating_orig', 0)), 1
-                    ),
-                    "efficiency_pct": float(row.get('Win_Pct_orig', 0.5)) * 0.8
-                }
-
-                team_obj = {
-                    "team": team_name,
-                    "season": "2025-26",
-                    "stats": stats,
-                    "playoff_status": status,
-                    "historical": sorted(history_by_team[team_name], key=lambda x: x['season']),
-                    "raw_prob": prob_made_playoffs  # Keep for sorting, remove later
-                }
-                division_teams[div_key].append(team_obj)
-                all_teams_data.append(team_obj)
+    # Parse the whole file ONCE into typed columns (see prediction_columns.py).
+    # Every cell is converted to float/int a single time here; the steps
+    # below only index into these arrays.
+    cols = load_prediction_csv(filepath)
+
+    return division_from_columns(cols)
+
+
+def division_from_columns(cols):
+    """build_division() for an already parsed PredictionColumns store."""
+    # Separate current season predictions from historical data (row indices)
+    current_season_rows, historical_rows = cols.split_season(PREDICTION_SEASON)
+
+    seasons = group_history(cols, historical_rows)
+    teams = current_season_teams(cols, current_season_rows, seasons)
+    if not teams:
+        return {"teams": [], "division_analytics": None, "rows": len(cols)}
+
+    # Sort teams by Azure ML playoff probability (best first)
+    teams.sort(key=lambda x: x.proba, reverse=True)
+
+    return {"teams": teams, "division_analytics": division_analytics(teams), "rows": len(cols)}
+
+
+def group_history(cols, historical_rows):
+    """STEP 3a: SeasonIndex of HistoryEntry records for the non-predicted seasons."""
+    # =========================================================================
+    # STEP 3a: Build Historical Data (for trend charts on the dashboard)
+    # =========================================================================
+    # Keyed by (team, season) and kept in season order as rows are appended
+    # (history.py), so no per-team sort is needed afterwards.
+    seasons = SeasonIndex()
+    for i in historical_rows:
+        seasons.append(cols.team[i], HistoryEntry(
+            cols.season[i],
+            cols.win_pct[i],
+            cols.off_rating[i],
+            cols.def_rating[i],
+            cols.made_playoffs[i] == 1
+        ))
+    return seasons
+
+
+# =============================================================================
+# PLAYOFF STATUS CLASSIFICATION
+# =============================================================================
+# We classify teams into 3 tiers based on Azure ML probability:
+#   > 0.8 (80%+)   → "clinched"   (Almost certainly in playoffs)
+#   < 0.2 (20%-)   → "eliminated"  (Almost certainly out)
+#   0.2 to 0.8     → "contender"   (Still in the race)
+# backtest.py checks these thresholds against past seasons.
+# =============================================================================
+CLINCHED_THRESHOLD = 0.8
+ELIMINATED_THRESHOLD = 0.2
+
+
+def playoff_status(prob_made_playoffs):
+    """"clinched" / "eliminated" / "contender" for an Azure ML playoff probability."""
+    if prob_made_playoffs > CLINCHED_THRESHOLD:
+        return "clinched"
+    if prob_made_playoffs < ELIMINATED_THRESHOLD:
+        return "eliminated"
+    return "contender"
+
+
+def current_season_teams(cols, current_season_rows, seasons):
+    """STEP 3b: one TeamSeason record per current-season row (unsorted)."""
+    # =========================================================================
+    # STEP 3b: Process Current Season (2025-26) Predictions
+    # =========================================================================
+    teams = []
+    for i in current_season_rows:
+        team_name = cols.team[i]
+
+        # Azure ML gives us a probability (0.0 - 1.0) of making playoffs
+        # This is the key ML output: "1_predicted_proba"
+        prob_made_playoffs = cols.predicted_proba[i]
+
+        # Clinched / contender / eliminated tier (see playoff_status())
+        status = playoff_status(prob_made_playoffs)
+
+        # Collect the key stats (already parsed to float by the loader)
+        off_rating = cols.off_rating[i]
+        def_rating = cols.def_rating[i]
+
+        team = TeamSeason(
+            team_name,
+            PREDICTION_SEASON,
+            cols.win_pct[i],
+            off_rating,
+            def_rating,
+            # Net Rating = Offense - Defense
+            # Positive = you score more than you allow (GOOD)
+            # Negative = you allow more than you score (BAD)
+            round(off_rating - def_rating, 1),
+            prob_made_playoffs,  # Sorts the standings; not written to the JSON
+            status,
+            seasons.series(team_name),
+        )
+
+        # Year-over-year deltas, rolling averages and trend direction,
+        # computed once here and read by the oracle reasoning (history.py)
+        seasons.append(team_name, team)
+        team.trend = seasons.trend(team_name, PREDICTION_SEASON)
+        teams.append(team)
+    return teams
+
+
+def division_analytics(teams):
+    """STEP 5a: summary for one division (teams sorted best first)."""
+    # ==========================================================================
+    # STEP 5a: Division-Level Analytics
+    # ==========================================================================
+    # Only depends on this division's own teams, so it is computed (and
+    # cached) together with the parsed rows.
+    div_analytics = {
+        "strongest_team": teams[0].team,
+        "weakest_team": teams[-1].team,
+        "playoff_teams": sum(1 for t in teams if t.playoff_status == 'clinched'),
+        "average_off_rating": round(sum(t.off_rating for t in teams) / len(teams), 1),
+        "average_def_rating": round(sum(t.def_rating for t in teams) / len(teams), 1),
+        "average_win_pct": round(sum(t.win_pct for t in teams) / len(teams), 3),
+    }
+
+    # Find the best offense and defense in this division
+    # Best offense = HIGHEST Off Rating
+    # Best defense = LOWEST Def Rating (allows fewest points)
+    best_off = max(teams, key=lambda x: x.off_rating)
+    best_def = min(teams, key=lambda x: x.def_rating)
+    div_analytics["best_offense"] = best_off.team
+    div_analytics["best_defense"] = best_def.team
+    return div_analytics
+
+
+def map_divisions(filepaths, workers=1, executor='process'):
+    """
+    Runs build_division() over every file on a worker pool.
+
+    executor="process" uses one process per core (parsing is CPU-bound);
+    "thread" is useful where processes cannot be spawned. Results come back
+    in the same order as filepaths (Executor.map preserves order).
+    """
+    if workers <= 1 or len(filepaths) <= 1:
+        return [build_division(path) for path in filepaths]
+    pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_cls(max_workers=min(workers, len(filepaths))) as pool:
+        return list(pool.map(build_division, filepaths))
+
+
+def output_meta():
+    """The "meta" object at the top of azure_predictions.json."""
+    return {
+        "model": "Azure ML VotingEnsemble (LightGBM + XGBoost)",
+        "version": "2.1",
+        "last_updated": "2026-02-19",
+        # These are the seasons used as TRAINING DATA for the ML model
+        "dataset_seasons": [
+            "2016-17", "2017-18", "2018-19", "2019-20", "2020-21",
+            "2021-22", "2022-23", "2023-24", "2024-25", "2025-26"
+        ],
+        "prediction_target": PREDICTION_SEASON
+    }
+
+
+def process_csvs(azure_folder=AZURE_FOLDER, csv_files=CSV_FILES, output_path=OUTPUT_PATH,
+                 score_specs=DEFAULT_SCORE_SPECS, use_cache=True, cache_dir=None,
+                 workers=1, executor='process', matchups_path=None,
+                 matchup_weights=DEFAULT_MATCHUP_WEIGHTS, simulations=0, sim_seed=0,
+                 games_played=55, shard_dir=None, oracle_path=None, schedule=SCHEDULE,
+                 tracer=None):
+    """
+    Builds every output from the prediction CSVs (STEPS 3-6 below).
+
+    Returns True when the outputs were (re)published, False when nothing
+    was written (no input changes or no data).
+    """
+    # Spans / counters for --profile (instrument.py); a disabled tracer
+    # still counts but never touches the clock.
+    tracer = tracer or Tracer(enabled=False)
+
+    # Output JSON structure — this is what the web dashboard reads
+    final_data = {
+        "meta": output_meta(),
+        "divisions": {}
+    }
+
+    # Incremental rebuilds: unchanged CSVs are loaded from the cache
+    # (see build_cache.py). The cache lives next to the output by default.
+    cache = None
+    if use_cache:
+        cache = BuildCache(cache_dir or os.path.join(os.path.dirname(output_path) or '.', '.oracle_cache'))
+
+    # ==========================================================================
+    # STEP 3: READ & PARSE ALL CSV FILES (one build_division() per file)
+    # ==========================================================================
+    # First pass: find the files and hash them (cheap). If the union of
+    # inputs is exactly what the last build used, stop here.
+    sources = resolve_sources(azure_folder, csv_files)  # [(div_key, filepath)]
+    source_hashes = []  # [(div_key, sha256)] — identifies the union of inputs
+    with tracer.span("STEP 3: hash inputs"):
+        if cache is not None:
+            source_hashes = [(div_key, file_sha256(filepath)) for div_key, filepath in sources]
+
+    # Nothing changed since the last build → leave the output file untouched
+    output_paths = [output_path] + [p for p in (matchups_path, oracle_path) if p]
+    if shard_dir:
+        output_paths.append(os.path.join(shard_dir, SHARD_MANIFEST))
+    if cache is not None:
+        key = build_key(source_hashes, score_specs, matchups_path, matchup_weights,
+                        simulations, sim_seed, games_played, oracle_path, schedule)
+        if cache.is_current(key, output_paths):
+            print(f"\nNo input changes — {output_path} is up to date")
+            return False
+
+    # Second pass: reuse cached divisions, parse the rest on a worker pool.
+    # Results are merged back in csv_files order, so the output is identical
+    # to a serial run no matter which worker finishes first.
+    division_results = {}  # div_key → {"teams": [TeamSeason, ...], "division_analytics": {...}}
+    pending = []           # [(div_key, filepath, sha256)] still to be parsed
+    hashes = dict(source_hashes)
+    with tracer.span("STEP 3: load cached divisions"):
+        for div_key, filepath in sources:
+            cached = cache.get_division(div_key, hashes[div_key]) if cache is not None else None
+            if cached is not None:
+                log.info("[cache] %s: unchanged, reusing parsed data", div_key)
+                tracer.count("divisions_cached")
+            else:
+                pending.append((div_key, filepath, hashes.get(div_key)))
+            division_results[div_key] = cached  # None = placeholder, keeps the order
+
+    with tracer.span("STEP 3: parse CSVs", files=len(pending), workers=workers):
+        built = map_divisions([filepath for _, filepath, _ in pending], workers, executor)
+    for (div_key, filepath, source_hash), result in zip(pending, built):
+        division_results[div_key] = result
+        tracer.count("divisions_parsed")
+        tracer.count("rows_read", result.get("rows", 0))
+        if cache is not None:
+            # Staged only: written by cache.save() once the build succeeded
+            cache.put_division(div_key, filepath, source_hash, result)
+
+    # Divisions without any current-season rows are left out of the output
+    division_results = {k: r for k, r in division_results.items() if r["teams"]}
+
+    # Flat list of ALL team records (for global min/max), in division order.
+    # Everything after this point works on positions in this list: divisions
+    # hold index ranges, score columns and simulation odds line up with it.
+    teams = []           # [TeamSeason]
+    team_divisions = []  # division key per team
+    division_index = {}  # div_key → [indices into teams]
+    for div_key, result in division_results.items():
+        start = len(teams)
+        teams.extend(result["teams"])
+        team_divisions.extend([div_key] * len(result["teams"]))
+        division_index[div_key] = range(start, len(teams))
 
     # ==========================================================================
     # STEP 4: CALCULATE GLOBAL MIN/MAX FOR NORMALIZATION
@@ -316,159 +540,506 @@ def process_csvs():
     #   - Win Percentage (higher = more wins)
     #     → Current: min=0.222 (SAC), max=0.755 (OKC), range=0.533
     # ==========================================================================
-    if not all_teams_data:
-        print("No data found!")
-        return
-
-    max_off = max(t['stats']['off_rating'] for t in all_teams_data)
-    min_off = min(t['stats']['off_rating'] for t in all_teams_data)
-    max_def = max(t['stats']['def_rating'] for t in all_teams_data)
-    min_def = min(t['stats']['def_rating'] for t in all_teams_data)
-    max_win = max(t['stats']['win_pct'] for t in all_teams_data)
-    min_win = min(t['stats']['win_pct'] for t in all_teams_data)
-
-    print(f"\n--- Normalization Bounds (Global) ---")
-    print(f"Offensive Rating: min={min_off}, max={max_off}")
-    print(f"Defensive Rating: min={min_def}, max={max_def}")
-    print(f"Win Percentage:   min={min_win}, max={max_win}")
-    print(f"-------------------------------------\n")
+    if not teams:
+        log.warning("No data found!")
+        return False
+
+    # Pull each scored stat out as one column (aligned with teams) and get
+    # every min/max in a single call (see scoring.py).
+    with tracer.span("STEP 4: bounds"):
+        columns = stat_columns(teams, score_specs)
+        bounds = compute_bounds(columns, score_specs)
+
+    for stat, (lo, hi) in bounds.items():
+        log.info("Normalization bounds (global) %-16s min=%s, max=%s", stat + ':', lo, hi)
 
     # ==========================================================================
     # STEP 5: NORMALIZE SCORES & BUILD FINAL DIVISION DATA
     # ==========================================================================
-    for div_key, teams in division_teams.items():
-        # Sort teams by Azure ML playoff probability (best first)
-        teams.sort(key=lambda x: x['raw_prob'], reverse=True)
-
-        # ======================================================================
-        # STEP 5a: Division-Level Analytics
-        # ======================================================================
-        div_analytics = {
-            "strongest_team": teams[0]['team'],
-            "weakest_team": teams[-1]['team'],
-            "playoff_teams": sum(1 for t in teams if t['playoff_status'] == 'clinched'),
-            "average_off_rating": round(sum(t['stats']['off_rating'] for t in teams) / len(teams), 1),
-            "average_def_rating": round(sum(t['stats']['def_rating'] for t in teams) / len(teams), 1),
-            "average_win_pct": round(sum(t['stats']['win_pct'] for t in teams) / len(teams), 3),
+    # STEP 5a (division analytics) already ran inside build_division().
+    #
+    # STEP 5b: NORMALIZE EACH TEAM'S STATS (0-100 scale)
+    # --------------------------------------------------------------------------
+    # This is the core normalization step. score_columns() scales each stat
+    # COLUMN at once with scoring.normalize_column, using GLOBAL min/max
+    # values across all 30 teams in 6 divisions:
+    #
+    # Global bounds (2025-26 season, 30 teams):
+    #   Off Rating:  min=108.5 (IND), max=121.0 (DEN), range=12.5
+    #   Def Rating:  min=105.9 (OKC), max=121.7 (UTA), range=15.8
+    #   Win Pct:     min=0.222 (SAC), max=0.755 (OKC), range=0.533
+    #
+    # 1. OFFENSIVE SCORE (Higher raw value = Higher score = Better)
+    #    offensive_score = normalize_column(off_rating column, 108.5, 121.0)
+    #    Example: BOS off_rating=120.0
+    #             → ((120.0 - 108.5) / (121.0 - 108.5)) × 100 = 92.0
+    #    Example: DEN off_rating=121.0
+    #             → ((121.0 - 108.5) / (121.0 - 108.5)) × 100 = 100.0
+    #    Example: IND off_rating=108.5
+    #             → ((108.5 - 108.5) / (121.0 - 108.5)) × 100 = 0.0
+    #
+    # 2. DEFENSIVE SCORE (Lower raw value = Better, so we INVERT)
+    #    def_norm        = normalize_column(def_rating column, 105.9, 121.7)
+    #    defensive_score = 100 - def_norm   (LOWER_IS_BETTER in the ScoreSpec)
+    #    Example: OKC def_rating=105.9 (best defense)
+    #             → def_norm = ((105.9 - 105.9) / (121.7 - 105.9)) × 100 = 0.0
+    #             → def_score = 100 - 0.0 = 100.0 (best!)
+    #    Example: UTA def_rating=121.7 (worst defense)
+    #             → def_norm = ((121.7 - 105.9) / (121.7 - 105.9)) × 100 = 100.0
+    #             → def_score = 100 - 100.0 = 0.0 (worst!)
+    #    Example: DET def_rating=108.4
+    #             → def_norm = ((108.4 - 105.9) / (121.7 - 105.9)) × 100 = 15.8
+    #             → def_score = 100 - 15.8 = 84.2 (elite defense)
+    #
+    # 3. WIN PERCENTAGE SCORE (Higher = Better)
+    #    win_pct_score = normalize_column(win_pct column, 0.222, 0.755)
+    #    Example: OKC win_pct=0.755
+    #             → ((0.755 - 0.222) / (0.755 - 0.222)) × 100 = 100.0
+    #    Example: SAC win_pct=0.222
+    #             → ((0.222 - 0.222) / (0.755 - 0.222)) × 100 = 0.0
+    #    Example: DET win_pct=0.745
+    #             → ((0.745 - 0.222) / (0.755 - 0.222)) × 100 = 98.1
+    #
+    # 4. WEIGHTED OVERALL RATING
+    #    overall = (off_score × 0.4) + (def_score × 0.4) + (win_score × 0.2)
+    #
+    #    The weights mean:
+    #      - 40% weight on offense (how well you score)
+    #      - 40% weight on defense (how well you prevent scoring)
+    #      - 20% weight on win record (overall season success)
+    #
+    #    Example: OKC → (73.6 × 0.4) + (100.0 × 0.4) + (100.0 × 0.2)
+    #             = 29.4 + 40.0 + 20.0 = 89.4 (top overall)
+    #    Example: DET → (63.2 × 0.4) + (84.2 × 0.4) + (98.1 × 0.2)
+    #             = 25.3 + 33.7 + 19.6 = 78.6 (strong)
+    #    Example: SAC → (13.6 × 0.4) + (12.0 × 0.4) + (0.0 × 0.2)
+    #             = 5.4 + 4.8 + 0.0 = 10.2 (bottom tier)
+    #
+    # All teams are scored in one batch (scoring.score_columns); weights and
+    # stat directions come from score_specs, so the 40/40/20 split above is
+    # just the default. The score columns stay aligned with `teams` and are
+    # rounded into each team's JSON in the final loop below.
+    # ==========================================================================
+    with tracer.span("STEP 5b: normalize scores"):
+        scores = score_columns(columns, bounds, score_specs)
+    tracer.count("teams_scored", len(teams))
+
+    # Every home/away pairing (matchups.py), reused by the oracle payload and
+    # the simulation below.
+    if matchups_path or simulations or oracle_path:
+        with tracer.span("STEP 5b: matchup matrix", teams=len(teams)):
+            inputs = matchup_inputs(teams)
+            home_prob = home_win_matrix(inputs, matchup_weights)
+            matchup_matrix = matchup_artifact(inputs, home_prob, matchup_weights)
+
+    # ==========================================================================
+    # STEP 5b' (optional): SIMPLIFIED PAYLOAD FOR THE MATCH CARDS
+    # ==========================================================================
+    # azure_oracle_prediction.json ("teams" + "matches") is built from the
+    # same team objects, so both dashboard files always agree (oracle_output.py).
+    if oracle_path:
+        with tracer.span("STEP 5b': oracle payload"):
+            oracle_data = build_oracle_payload(
+                teams, [division_conference(k) for k in team_divisions],
+                matchup_matrix, schedule, last_updated=final_data['meta']['last_updated'])
+
+    # ==========================================================================
+    # STEP 5c (optional): MONTE CARLO PLAYOFF ODDS
+    # ==========================================================================
+    # Plays out the rest of the season and the playoff bracket `simulations`
+    # times (simulate.py) and stores each team's odds under "simulation".
+    odds = [None] * len(teams)
+    if simulations:
+        conferences = {}
+        for i, div_key in enumerate(team_divisions):
+            conferences.setdefault(division_conference(div_key), []).append(i)
+        with tracer.span("STEP 5c: simulate", simulations=simulations):
+            odds = simulate_season(inputs['win_pct'], list(conferences.values()), home_prob,
+                                   n_sims=simulations, seed=sim_seed,
+                                   games_played=games_played, workers=workers)
+        final_data['meta']['simulation'] = {
+            "simulations": simulations,
+            "seed": sim_seed,
+            "games_played": games_played,
         }
+        log.info("Simulated %d seasons (%d games played)", simulations, games_played)
 
-        # Find the best offense and defense in this division
-        # Best offense = HIGHEST Off Rating
-        # Best defense = LOWEST Def Rating (allows fewest points)
-        best_off = max(teams, key=lambda x: x['stats']['off_rating'])
-        best_def = min(teams, key=lambda x: x['stats']['def_rating'])
-        div_analytics["best_offense"] = best_off['team']
-        div_analytics["best_defense"] = best_def['team']
-
-        # ======================================================================
-        # STEP 5b: NORMALIZE EACH TEAM'S STATS (0-100 scale)
-        # ======================================================================
-        # This is the core normalization step. For each team, using GLOBAL
-        # min/max values across all 30 teams in 6 divisions:
-        #
-        # Global bounds (2025-26 season, 30 teams):
-        #   Off Rating:  min=108.5 (IND), max=121.0 (DEN), range=12.5
-        #   Def Rating:  min=105.9 (OKC), max=121.7 (UTA), range=15.8
-        #   Win Pct:     min=0.222 (SAC), max=0.755 (OKC), range=0.533
-        #
-        # 1. OFFENSIVE SCORE (Higher raw value = Higher score = Better)
-        #    off_score = normalize(off_rating, 108.5, 121.0)
-        #    Example: BOS off_rating=120.0
-        #             → ((120.0 - 108.5) / (121.0 - 108.5)) × 100 = 92.0
-        #    Example: DEN off_rating=121.0
-        #             → ((121.0 - 108.5) / (121.0 - 108.5)) × 100 = 100.0
-        #    Example: IND off_rating=108.5
-        #             → ((108.5 - 108.5) / (121.0 - 108.5)) × 100 = 0.0
-        #
-        # 2. DEFENSIVE SCORE (Lower raw value = Better, so we INVERT)
-        #    def_norm  = normalize(def_rating, 105.9, 121.7)
-        #    def_score = 100 - def_norm
-        #    Example: OKC def_rating=105.9 (best defense)
-        #             → def_norm = ((105.9 - 105.9) / (121.7 - 105.9)) × 100 = 0.0
-        #             → def_score = 100 - 0.0 = 100.0 (best!)
-        #    Example: UTA def_rating=121.7 (worst defense)
-        #             → def_norm = ((121.7 - 105.9) / (121.7 - 105.9)) × 100 = 100.0
-        #             → def_score = 100 - 100.0 = 0.0 (worst!)
-        #    Example: DET def_rating=108.4
-        #             → def_norm = ((108.4 - 105.9) / (121.7 - 105.9)) × 100 = 15.8
-        #             → def_score = 100 - 15.8 = 84.2 (elite defense)
-        #
-        # 3. WIN PERCENTAGE SCORE (Higher = Better)
-        #    win_score = normalize(win_pct, 0.222, 0.755)
-        #    Example: OKC win_pct=0.755
-        #             → ((0.755 - 0.222) / (0.755 - 0.222)) × 100 = 100.0
-        #    Example: SAC win_pct=0.222
-        #             → ((0.222 - 0.222) / (0.755 - 0.222)) × 100 = 0.0
-        #    Example: DET win_pct=0.745
-        #             → ((0.745 - 0.222) / (0.755 - 0.222)) × 100 = 98.1
-        #
-        # 4. WEIGHTED OVERALL RATING
-        #    overall = (off_score × 0.4) + (def_score × 0.4) + (win_score × 0.2)
-        #
-        #    The weights mean:
-        #      - 40% weight on offense (how well you score)
-        #      - 40% weight on defense (how well you prevent scoring)
-        #      - 20% weight on win record (overall season success)
-        #
-        #    Example: OKC → (73.6 × 0.4) + (100.0 × 0.4) + (100.0 × 0.2)
-        #             = 29.4 + 40.0 + 20.0 = 89.4 (top overall)
-        #    Example: DET → (63.2 × 0.4) + (84.2 × 0.4) + (98.1 × 0.2)
-        #             = 25.3 + 33.7 + 19.6 = 78.6 (strong)
-        #    Example: SAC → (13.6 × 0.4) + (12.0 × 0.4) + (0.0 × 0.2)
-        #             = 5.4 + 4.8 + 0.0 = 10.2 (bottom tier)
-        # ======================================================================
+    # Output boundary: records → the dashboard's JSON objects (records.py)
+    # Per-team scores only at -vv: formatting 30+ lines per run is not free
+    show_teams = log.isEnabledFor(logging.DEBUG)
+    for div_key, indices in division_index.items():
         final_teams = []
-        for t in teams:
-            # --- Offensive Score ---
-            # Higher Off Rating = Higher Score (direct normalization)
-            off_score = normalize(t['stats']['off_rating'], min_off, max_off)
-
-            # --- Defensive Score ---
-            # Lower Def Rating = Better defense, so INVERT the normalization
-            # Step A: Normalize normally (low def_rating → low score)
-            def_norm = normalize(t['stats']['def_rating'], min_def, max_def)
-            # Step B: Invert it (100 - score), so low def_rating → HIGH score
-            def_score = 100 - def_norm
-
-            # --- Win Percentage Score ---
-            # Higher Win% = Higher Score (direct normalization)
-            win_score = normalize(t['stats']['win_pct'], min_win, max_win)
-
-            # --- Weighted Overall Rating ---
-            # Combines all three scores with predefined weights
-            overall = (off_score * 0.4) + (def_score * 0.4) + (win_score * 0.2)
-
-            # Store the normalized scores in the team object
-            t['normalized_scores'] = {
-                "offensive_score": round(off_score, 1),
-                "defensive_score": round(def_score, 1),
-                "win_pct_score": round(win_score, 1),
-                "overall_rating": round(overall, 1)
-            }
-
-            # Print for debugging/verification
-            print(f"  {t['team']:30s} | OFF: {off_score:5.1f} | DEF: {def_score:5.1f} | WIN: {win_score:5.1f} | OVERALL: {overall:5.1f}")
-
-            # Remove temporary helper key (not needed in final JSON)
-            del t['raw_prob']
-            final_teams.append(t)
+        for i in indices:
+            ns = rounded_scores(scores, i)
+            if show_teams:
+                log.debug("  %-30s | %s", teams[i].team, " | ".join(f"{k}: {v:5.1f}" for k, v in ns.items()))
+            final_teams.append(teams[i].to_json(ns, odds[i]))
 
         # Build the final division object
         final_data['divisions'][div_key] = {
             "name": f"{div_key.capitalize()} Division",
-            "conference": "Eastern" if div_key in ['atlantic', 'central', 'southeast'] else "Western",
+            "conference": division_conference(div_key),
             "teams": final_teams,
-            "division_analytics": div_analytics
+            "division_analytics": division_results[div_key]["division_analytics"]
         }
 
     # ==========================================================================
     # STEP 6: WRITE OUTPUT JSON
     # ==========================================================================
-    output_path = 'c:/Users/Vince/Downloads/NBA-Oracle/azure_predictions.json'
-    with open(output_path, 'w') as f:
-        json.dump(final_data, f, indent=2)
+    with tracer.span("STEP 6: write JSON"):
+        with atomic_write(output_path) as f:
+            json.dump(final_data, f, indent=2)
+    tracer.count_file(output_path)
     print(f"\nSuccessfully created {output_path}")
 
+    if oracle_path:
+        with tracer.span("STEP 6: write oracle JSON"):
+            with atomic_write(oracle_path) as f:
+                json.dump(oracle_data, f, indent=2)
+        tracer.count_file(oracle_path)
+        print(f"Successfully created {oracle_path} ({len(oracle_data['matches'])} matches)")
+
+    # ==========================================================================
+    # STEP 6a (optional): SHARDED, PRECOMPRESSED OUTPUT
+    # ==========================================================================
+    # Small index + per-division + per-team files (compact JSON with .gz
+    # siblings, .br too when brotli is installed, and a hash manifest) so the
+    # dashboard can render the first division without downloading everything
+    # (shards.py).
+    if shard_dir:
+        with tracer.span("STEP 6a: shards"):
+            manifest, written = write_sharded_output(final_data, shard_dir)
+        for rel_path in written:
+            entry = manifest['files'][rel_path]
+            tracer.count("bytes_written", entry['bytes'] + sum(entry['encodings'].values()))
+        tracer.count("shards_written", len(written))
+        print(f"Sharded output in {shard_dir}: {len(written)} of {len(manifest['files'])} shards changed")
+
+    # ==========================================================================
+    # STEP 6b: HEAD-TO-HEAD MATCHUP MATRIX (every home/away pairing)
+    # ==========================================================================
+    # Any scheduled game becomes a lookup into this artifact (matchups.py).
+    if matchups_path:
+        with tracer.span("STEP 6b: write matchup matrix"):
+            write_matchup_matrix(matchup_matrix, matchups_path)
+        tracer.count_file(matchups_path)
+        n = len(matchup_matrix['ids'])
+        print(f"Successfully created {matchups_path} ({n}×{n} matchups)")
+
+    if cache is not None:
+        with tracer.span("cache save"):
+            cache.record_build(key, output_paths)
+            cache.save()
+    return True
+
+
+# =============================================================================
+# STREAMING MODE (--stream): two passes, one division in memory at a time
+# =============================================================================
+# process_csvs() keeps every division, team and history entry until the
+# final json.dump — it needs them all for the global min/max (STEP 4), the
+# matchup matrix and the simulation. For very large exports (many leagues,
+# many decades) stream_csvs() trades those extras for bounded memory:
+#
+#   PASS 1: scan_prediction_bounds() reads each CSV row by row and keeps
+#           only a running min/max per scored stat (prediction_columns.py).
+#   PASS 2: a generator pipeline — build_division() for ONE file, score its
+#           teams against the global bounds from pass 1, turn them into JSON
+#           objects one at a time — feeds the incremental writer
+#           (streaming.py), which writes each division/team as it arrives.
+#
+# Peak memory is one division's rows + teams, whatever the number of files.
+# The JSON written is byte-identical to process_csvs(); the build cache,
+# matchup matrix, oracle payload, shards and simulation are not produced.
+# =============================================================================
+def scan_bounds(sources, score_specs=DEFAULT_SCORE_SPECS, tracer=None):
+    """PASS 1: global {stat: (min, max)} over the current season of every file."""
+    tracer = tracer or Tracer(enabled=False)
+    stats = [spec.stat for spec in score_specs]
+    bounds = {}
+    for _, filepath in sources:
+        file_bounds, rows = scan_prediction_bounds(filepath, PREDICTION_SEASON, stats)
+        bounds = merge_bounds(bounds, file_bounds)
+        tracer.count("rows_scanned", rows)
+    return bounds
+
+
+def iter_divisions(sources, bounds, score_specs=DEFAULT_SCORE_SPECS, tracer=None):
+    """PASS 2: yields (div_key, division object) with a lazy "teams" iterator."""
+    tracer = tracer or Tracer(enabled=False)
+    show_teams = log.isEnabledFor(logging.DEBUG)
+    for div_key, filepath in sources:
+        with tracer.span("PASS 2: parse division", division=div_key):
+            result = build_division(filepath)
+        tracer.count("divisions_parsed")
+        tracer.count("rows_read", result["rows"])
+        teams = result["teams"]
+        if not teams:
+            continue  # Same as process_csvs(): no current-season rows → left out
+
+        scores = score_columns(stat_columns(teams, score_specs), bounds, score_specs)
+        tracer.count("teams_scored", len(teams))
+
+        def team_objects(teams=teams, scores=scores):
+            for i, team in enumerate(teams):
+                ns = rounded_scores(scores, i)
+                if show_teams:
+                    log.debug("  %-30s | %s", team.team, " | ".join(f"{k}: {v:5.1f}" for k, v in ns.items()))
+                yield team.to_json(ns)
+
+        yield div_key, {
+            "name": f"{div_key.capitalize()} Division",
+            "conference": division_conference(div_key),
+            "teams": team_objects(),
+            "division_analytics": result["division_analytics"],
+        }
+
+
+def stream_csvs(azure_folder=AZURE_FOLDER, csv_files=CSV_FILES, output_path=OUTPUT_PATH,
+                score_specs=DEFAULT_SCORE_SPECS, output_format='json', tracer=None):
+    """
+    Streaming (two-pass) version of process_csvs() for the main output only.
+
+    output_format: "json" (same bytes as process_csvs) or "ndjson"
+    (see streaming.py). Returns True when the output was written.
+    """
+    tracer = tracer or Tracer(enabled=False)
+    sources = resolve_sources(azure_folder, csv_files)
+
+    with tracer.span("PASS 1: scan bounds", files=len(sources)):
+        bounds = scan_bounds(sources, score_specs, tracer)
+    if len(bounds) < len(score_specs):
+        log.warning("No data found!")
+        return False
+    for stat, (lo, hi) in bounds.items():
+        log.info("Normalization bounds (global) %-16s min=%s, max=%s", stat + ':', lo, hi)
+
+    divisions = iter_divisions(sources, bounds, score_specs, tracer)
+    with tracer.span("PASS 2: stream output", format=output_format):
+        if output_format == 'ndjson':
+            write_ndjson_stream(output_path, output_meta(), divisions)
+        else:
+            write_json_stream(output_path, {"meta": output_meta(),
+                                            "divisions": StreamedObject(divisions)})
+    tracer.count_file(output_path)
+    print(f"\nSuccessfully created {output_path} (streamed)")
+    return True
+
+
+# =============================================================================
+# STEP 7: COMMAND-LINE ENTRY POINT
+# =============================================================================
+# Examples:
+#   python process/process_predictions.py
+#   python process/process_predictions.py --input-dir exports/2026 \
+#       --glob "*_predictions.csv" --output build/azure_predictions.json -j 8
+#   python process/process_predictions.py --division atlantic=atl.csv \
+#       --division central=cen.csv --weight win_pct=0.3
+# =============================================================================
+def division_key_from_filename(filename):
+    """"central-division_predictions.csv" → "central" (used with --glob)."""
+    stem = os.path.splitext(os.path.basename(filename))[0].lower()
+    return re.sub(r'([-_]?division)?[-_]?predictions$', '', stem) or stem
+
+
+def parse_pairs(values, parser, option, convert=str):
+    """["a=1", "b=2"] → {"a": 1, "b": 2}; reports bad input via parser.error."""
+    pairs = {}
+    for value in values or []:
+        key, sep, raw = value.partition('=')
+        if not sep or not key or not raw:
+            parser.error(f"{option} expects KEY=VALUE, got {value!r}")
+        try:
+            pairs[key] = convert(raw)
+        except ValueError:
+            parser.error(f"{option} has an invalid value: {value!r}")
+    return pairs
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Post-process Azure ML prediction CSVs into the NBA Oracle dashboard JSON.")
+    parser.add_argument('--input-dir', default=AZURE_FOLDER,
+                        help="folder containing the prediction CSVs (default: %(default)s)")
+    files = parser.add_mutually_exclusive_group()
+    files.add_argument('--division', action='append', metavar='KEY=FILE',
+                       help="division key → CSV file (relative to --input-dir); repeatable")
+    files.add_argument('--glob', metavar='PATTERN',
+                       help="pick up every CSV matching PATTERN in --input-dir; the division "
+                            "key is taken from the file name")
+    parser.add_argument('-o', '--output', default=OUTPUT_PATH,
+                        help="output JSON path (default: %(default)s)")
+    # Serial by default: for a handful of division CSVs, starting a process
+    # pool and pickling the results back costs more than parsing them
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="parallel workers for parsing and simulation "
+                             "(default: %(default)s; worth it for many large CSVs)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="worker pool type (default: %(default)s)")
+    parser.add_argument('--weight', action='append', metavar='STAT=WEIGHT',
+                        help="override an overall-rating weight, e.g. win_pct=0.3; repeatable")
+    parser.add_argument('--matchups', metavar='PATH',
+                        help="all-pairs matchup matrix output (default: matchup_matrix.json "
+                             "next to --output)")
+    parser.add_argument('--no-matchups', action='store_true',
+                        help="skip the matchup matrix")
+    parser.add_argument('--oracle', metavar='PATH',
+                        help="simplified teams + matches payload (default: "
+                             "azure_oracle_prediction.json next to --output)")
+    parser.add_argument('--no-oracle', action='store_true',
+                        help="skip azure_oracle_prediction.json")
+    parser.add_argument('--schedule', metavar='FILE',
+                        help="JSON list of games ({away, home, time, venue}) for the match "
+                             "predictions (default: the built-in Feb 19, 2026 slate)")
+    parser.add_argument('--shard-dir', metavar='DIR',
+                        help="also write the output as compact index/division/team shards "
+                             "with .gz siblings (+ .br if the optional brotli package is "
+                             "installed) and a hash manifest")
+    parser.add_argument('--simulations', type=int, default=0, metavar='N',
+                        help="Monte Carlo seasons to simulate for playoff odds (default: off)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed for --simulations (default: %(default)s)")
+    parser.add_argument('--games-played', type=int, default=55,
+                        help="games already played per team (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the incremental build cache and rebuild everything")
+    parser.add_argument('--cache-dir',
+                        help="cache location (default: .oracle_cache next to the output)")
+    parser.add_argument('--stream', action='store_true',
+                        help="two-pass streaming mode: bounded memory, writes only --output "
+                             "(no cache, matchups, oracle payload, shards or simulation)")
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json', dest='output_format',
+                        help="--stream output format (default: %(default)s)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running: rebuild whenever CSVs in --input-dir change")
+    parser.add_argument('--poll-interval', type=float, default=1.0, metavar='SECONDS',
+                        help="--watch polling interval (default: %(default)s)")
+    parser.add_argument('--debounce', type=float, default=2.0, metavar='SECONDS',
+                        help="--watch: wait until the folder is quiet this long (default: %(default)s)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="log progress (-v) and per-team scores (-vv); quiet by default")
+    parser.add_argument('--profile', metavar='TRACE',
+                        help="write a JSON trace of per-step spans and counters (Chrome "
+                             "trace-event format, see instrument.py)")
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help="also write cProfile stats for the run (pstats format)")
+    return parser
+
+
+def resolve_csv_files(args, parser):
+    """Division → CSV mapping from --division / --glob (default: CSV_FILES)."""
+    if args.division:
+        return parse_pairs(args.division, parser, '--division')
+    if args.glob:
+        csv_files = {}
+        for path in sorted(glob.glob(os.path.join(args.input_dir, args.glob))):
+            div_key = division_key_from_filename(path)
+            if div_key in csv_files:
+                parser.error(f"--glob matched two files for division {div_key!r}: "
+                             f"{csv_files[div_key]} and {os.path.basename(path)}")
+            csv_files[div_key] = os.path.relpath(path, args.input_dir)
+        if not csv_files:
+            parser.error(f"--glob {args.glob!r} matched no files in {args.input_dir}")
+        return csv_files
+    return CSV_FILES
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose)
+
+    score_specs = DEFAULT_SCORE_SPECS
+    if args.weight:
+        try:
+            score_specs = with_weights(score_specs, parse_pairs(args.weight, parser, '--weight', float))
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.simulations < 0:
+        parser.error("--simulations must be 0 (off) or a positive number of seasons")
+    if not 0 <= args.games_played <= SEASON_GAMES:
+        parser.error(f"--games-played must be between 0 and {SEASON_GAMES}")
+
+    if args.stream:
+        extras = [opt for opt, used in (('--matchups', args.matchups), ('--oracle', args.oracle),
+                                        ('--shard-dir', args.shard_dir),
+                                        ('--simulations', args.simulations)) if used]
+        if extras:
+            parser.error(f"--stream writes only --output; drop {', '.join(extras)}")
+        args.no_matchups = args.no_oracle = True
+    elif args.output_format != 'json':
+        parser.error("--format ndjson requires --stream")
+
+    matchups_path = None
+    if not args.no_matchups:
+        matchups_path = args.matchups or os.path.join(os.path.dirname(args.output), 'matchup_matrix.json')
+
+    oracle_path = None
+    if not args.no_oracle:
+        oracle_path = args.oracle or os.path.join(os.path.dirname(args.output), 'azure_oracle_prediction.json')
+
+    schedule = load_schedule(args.schedule) if args.schedule else SCHEDULE
+
+    def build():
+        tracer = Tracer(enabled=bool(args.profile))
+        profiler = cProfile.Profile() if args.cprofile else None
+        if profiler is not None:
+            profiler.enable()
+        if args.stream:
+            with tracer.span("stream_csvs"):
+                published = stream_csvs(
+                    azure_folder=args.input_dir,
+                    csv_files=resolve_csv_files(args, parser),
+                    output_path=args.output,
+                    score_specs=score_specs,
+                    output_format=args.output_format,
+                    tracer=tracer,
+                )
+        else:
+            with tracer.span("process_csvs"):
+                published = process_csvs(
+                    azure_folder=args.input_dir,
+                    # Re-resolved per build so --watch picks up new --glob matches
+                    csv_files=resolve_csv_files(args, parser),
+                    output_path=args.output,
+                    score_specs=score_specs,
+                    use_cache=not args.no_cache,
+                    cache_dir=args.cache_dir,
+                    workers=args.workers,
+                    executor=args.executor,
+                    matchups_path=matchups_path,
+                    simulations=args.simulations,
+                    sim_seed=args.seed,
+                    games_played=args.games_played,
+                    shard_dir=args.shard_dir,
+                    oracle_path=oracle_path,
+                    schedule=schedule,
+                    tracer=tracer,
+                )
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"cProfile stats written to {args.cprofile}")
+        if args.profile:
+            tracer.write(args.profile)
+            print(f"Trace written to {args.profile}")
+        return published
+
+    if args.watch:
+        # Same log-and-retry path as every rebuild: a bad CSV on startup
+        # must not stop the watcher before it has started
+        try_build(build, "Initial build failed; waiting for the next change")
+        # Only the files a build can read trigger a rebuild
+        watch(args.input_dir, build, pattern=args.glob or '*.csv',
+              interval=args.poll_interval, debounce=args.debounce)
+        return 0
+    try:
+        build()
+    except (TeamIdCollision, SimulationError) as exc:
+        parser.error(str(exc))
+    return 0
+
 
 if __name__ == "__main__":
-    process_csvs()
+    raise SystemExit(main())
@@ -0,0 +1,260 @@
+"""
+==============================================================================
+NBA ORACLE — Publishing: Atomic Writes & Content-Addressed Deploys
+==============================================================================
+Purpose: Gets outputs from this script to the dashboard safely and cheaply.
+
+1. ATOMIC WRITES (used by every output of process_predictions.py)
+   The dashboard (and the upload job) may read an output file at any
+   moment, including while a rebuild is writing it. Every output is
+   therefore written to a temporary file in the SAME directory and moved
+   into place with os.replace(), which is atomic on POSIX and Windows:
+   readers see either the old file or the new one, never a half-written
+   JSON document.
+
+      with atomic_write('azure_predictions/azure_predictions.json') as f:
+          json.dump(final_data, f, indent=2)
+
+   If the block raises, the temporary file is removed and the previous
+   output is left untouched.
+
+2. DEPLOY MANIFEST (python process/publish.py, run by the deploy workflow)
+   Instead of re-uploading the whole site on every push:
+
+     a) Hash every deployable file (DEPLOY_EXCLUDE skips sources, raw
+        CSVs, caches) into deploy-manifest.json:
+          {"version": 1,
+           "files": {"index.html": {"sha256", "bytes", "cache_control"},
+                     "azure_predictions/azure_predictions.json": {...}}}
+     b) Diff it against the previous (live) manifest and write the minimal
+        plan, one tab-separated line per blob operation:
+          upload <TAB> local file <TAB> blob name <TAB> Cache-Control
+          delete <TAB> blob name
+
+   Every blob keeps its stable name and is revalidated by browsers
+   (Cache-Control: no-cache), so an unchanged file costs a 304 and a
+   changed one is picked up on the next load.
+
+   STALE BLOBS (--live-blobs): the workflow also passes the list of blobs
+   actually in the container. Anything the new manifest does not account
+   for is deleted too, including files pushed before deploys used a
+   manifest (e.g. sources and raw CSVs from the old whole-tree upload).
+
+   Compare two manifests locally:
+      python process/publish.py --diff old-manifest.json new-manifest.json
+==============================================================================
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import json
+import os
+import secrets
+import sys
+
+MANIFEST_VERSION = 1
+DEPLOY_MANIFEST = 'deploy-manifest.json'
+DEPLOY_PLAN = 'deploy-plan.tsv'
+
+# Never deployed: matched against every path segment and the relative path
+DEPLOY_EXCLUDE = (
+    '.git', '.github', '.gitignore', '.oracle_cache', '__pycache__', '*.py[cod]', '*.tmp',
+    'process', 'csvnba', 'README.md',
+    DEPLOY_MANIFEST, DEPLOY_PLAN,
+)
+
+CACHE_REVALIDATE = 'no-cache'
+
+
+# =============================================================================
+# 1. ATOMIC WRITES
+# =============================================================================
+@contextlib.contextmanager
+def atomic_write(path, mode='w', **open_kwargs):
+    """open(path, mode) that only replaces `path` once the block succeeds."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # Created 0666 minus the umask like any new file (mkstemp would make it
+    # 0600); O_EXCL plus a random name keeps the temp file private to us.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{secrets.token_hex(4)}.tmp')
+        try:
+            fd = os.open(tmp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+# =============================================================================
+# 2. DEPLOY MANIFEST & PLAN
+# =============================================================================
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _excluded(rel_path, exclude):
+    parts = rel_path.split('/')
+    return any(fnmatch.fnmatch(rel_path, pat) or any(fnmatch.fnmatch(p, pat) for p in parts)
+               for pat in exclude)
+
+
+def deployable_files(root, exclude=DEPLOY_EXCLUDE):
+    """Sorted relative (forward-slash) paths of every file to deploy."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        rel_dir = '' if rel_dir == '.' else rel_dir + '/'
+        # Prune excluded directories instead of walking into them
+        dirnames[:] = [d for d in dirnames if not _excluded(rel_dir + d, exclude)]
+        found.extend(rel_dir + name for name in filenames if not _excluded(rel_dir + name, exclude))
+    return sorted(found)
+
+
+def build_manifest(root, exclude=DEPLOY_EXCLUDE):
+    """Content-addressed manifest of everything under root that gets deployed."""
+    files = {}
+    for rel_path in deployable_files(root, exclude):
+        path = os.path.join(root, *rel_path.split('/'))
+        files[rel_path] = {"sha256": file_sha256(path), "bytes": os.path.getsize(path),
+                           "cache_control": CACHE_REVALIDATE}
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def load_manifest(path):
+    """A previous manifest, or an empty one (first deploy / unreadable file)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "files": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "files": {}}
+    return manifest
+
+
+def plan_deploy(manifest, previous):
+    """
+    (uploads, deletes) to go from the previous deploy to this manifest.
+
+    uploads: [(relative file, blob name, Cache-Control)] for every new or
+             changed file. deletes: [blob name] for files no longer deployed.
+    """
+    files, old_files = manifest["files"], previous.get("files", {})
+    uploads = []
+    for rel_path, entry in files.items():
+        old = old_files.get(rel_path)
+        if old is not None and old.get("sha256") == entry["sha256"]:
+            continue
+        uploads.append((rel_path, rel_path, entry["cache_control"]))
+    deletes = sorted(p for p in old_files if p not in files)
+    return uploads, deletes
+
+
+def load_blob_list(path):
+    """Blob names, one per line (az storage blob list ... -o tsv)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def stale_blobs(manifest, live_blobs, deletes=()):
+    """
+    Live blobs this deploy does not account for: not a file or the manifest
+    itself, and not already planned for deletion. Covers everything uploaded
+    before deploys were manifest-based (process/*.py, csvnba/*.csv, ...)
+    that no previous manifest lists.
+    """
+    known = set(manifest["files"]) | {DEPLOY_MANIFEST}
+    return sorted(set(live_blobs) - known - set(deletes))
+
+
+def write_plan(path, uploads, deletes, manifest_file=None):
+    """Tab-separated plan; the manifest itself is uploaded last, after the files."""
+    with atomic_write(path, encoding='utf-8', newline='\n') as f:
+        for local, name, cache_control in uploads:
+            f.write(f"upload\t{local}\t{name}\t{cache_control}\n")
+        if manifest_file and (uploads or deletes):
+            f.write(f"upload\t{manifest_file}\t{DEPLOY_MANIFEST}\t{CACHE_REVALIDATE}\n")
+        for name in deletes:
+            f.write(f"delete\t{name}\n")
+
+
+def diff_manifests(old, new):
+    """{"added", "changed", "removed"} relative paths between two manifests."""
+    old_files, new_files = old.get("files", {}), new.get("files", {})
+    return {
+        "added": sorted(p for p in new_files if p not in old_files),
+        "changed": sorted(p for p in new_files
+                          if p in old_files and old_files[p]["sha256"] != new_files[p]["sha256"]),
+        "removed": sorted(p for p in old_files if p not in new_files),
+    }
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Hash the deployable site into a manifest and plan the minimal upload.")
+    parser.add_argument('--root', default='.', help="site root to deploy (default: %(default)s)")
+    parser.add_argument('--previous', metavar='MANIFEST',
+                        help="manifest of the live deploy (default: ROOT/" + DEPLOY_MANIFEST + ")")
+    parser.add_argument('--manifest', metavar='PATH',
+                        help="where to write the new manifest (default: ROOT/" + DEPLOY_MANIFEST + ")")
+    parser.add_argument('--plan', metavar='PATH',
+                        help="where to write the upload/delete plan (default: ROOT/" + DEPLOY_PLAN + ")")
+    parser.add_argument('--live-blobs', metavar='FILE',
+                        help="names of the blobs currently deployed, one per line; any the "
+                             "new manifest does not account for is deleted")
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help="extra glob pattern to leave out of the deploy; repeatable")
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'),
+                        help="only compare two manifests and print what changed")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.diff:
+        changes = diff_manifests(load_manifest(args.diff[0]), load_manifest(args.diff[1]))
+        for kind, paths in changes.items():
+            for path in paths:
+                print(f"{kind:8s} {path}")
+        print(", ".join(f"{len(paths)} {kind}" for kind, paths in changes.items()), file=sys.stderr)
+        return 0
+
+    manifest_path = args.manifest or os.path.join(args.root, DEPLOY_MANIFEST)
+    plan_path = args.plan or os.path.join(args.root, DEPLOY_PLAN)
+    previous = load_manifest(args.previous or manifest_path)
+
+    manifest = build_manifest(args.root, DEPLOY_EXCLUDE + tuple(args.exclude))
+    uploads, deletes = plan_deploy(manifest, previous)
+    if args.live_blobs:
+        deletes += stale_blobs(manifest, load_blob_list(args.live_blobs), deletes)
+    with atomic_write(manifest_path, encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    write_plan(plan_path, uploads, deletes, manifest_file=os.path.relpath(manifest_path, args.root))
+
+    total = sum(e["bytes"] for e in manifest["files"].values())
+    upload_bytes = sum(manifest["files"][local]["bytes"] for local, _, _ in uploads)
+    print(f"{len(manifest['files'])} deployable files ({total / 1e6:.1f} MB); "
+          f"plan: {len(uploads)} uploads ({upload_bytes / 1e6:.2f} MB), {len(deletes)} deletes "
+          f"→ {plan_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
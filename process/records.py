@@ -0,0 +1,127 @@
+"""
+==============================================================================
+NBA ORACLE — Compact Team Records
+==============================================================================
+Purpose: The in-memory model of the post-processor. One slotted object per
+         team-season instead of a tree of dicts, converted to the dashboard
+         JSON shape only when the output is written.
+
+WHY NOT DICTS?
+  - Every team used to be a dict holding a "stats" dict, a list of
+    "historical" dicts and temporary keys ("raw_prob") that were added and
+    deleted again. Each of those dicts carries its own hash table.
+  - A __slots__ object stores its fields in a fixed array, a fraction of the
+    size of a dict, and the team / season strings are the interned ones from
+    prediction_columns.py, so "2025-26" exists once in memory.
+  - process_csvs() keeps ONE flat list of TeamSeason records; divisions hold
+    indices into it instead of references to nested dicts.
+
+RECORDS:
+  HistoryEntry   one past season of a team (trend charts)
+  TeamSeason     one team in the predicted season, with its history and
+                 precomputed trend (history.TeamTrend)
+
+OUTPUT BOUNDARY:
+  TeamSeason.to_json() rebuilds exactly the old JSON object:
+
+    {"team", "season", "stats": {win_pct, off_rating, def_rating, net_rating,
+     efficiency_pct}, "playoff_status", "historical": [...], "trend": {...},
+     "normalized_scores": {...}, "simulation": {...}}   ← only with --simulations
+
+  to_row() / from_row() are the compact list form stored in the build cache.
+==============================================================================
+"""
+
+import sys
+
+from history import TeamTrend
+
+
+class HistoryEntry:
+    """One historical (non-predicted) season of a team."""
+
+    __slots__ = ('season', 'win_pct', 'off_rating', 'def_rating', 'made_playoffs')
+
+    def __init__(self, season, win_pct, off_rating, def_rating, made_playoffs):
+        self.season = season
+        self.win_pct = win_pct
+        self.off_rating = off_rating
+        self.def_rating = def_rating
+        self.made_playoffs = made_playoffs
+
+    def to_json(self):
+        return {
+            "season": self.season,
+            "win_pct": self.win_pct,
+            "off_rating": self.off_rating,
+            "def_rating": self.def_rating,
+            "made_playoffs": self.made_playoffs
+        }
+
+    def to_row(self):
+        return [self.season, self.win_pct, self.off_rating, self.def_rating, self.made_playoffs]
+
+
+class TeamSeason:
+    """
+    One team in the predicted season.
+
+    proba is the Azure ML playoff probability (1_predicted_proba). It orders
+    the standings and feeds the matchup model but is not part of the output.
+    historical is a tuple of HistoryEntry, oldest season first; trend is the
+    TeamTrend computed from it once per build (history.py).
+    """
+
+    __slots__ = ('team', 'season', 'win_pct', 'off_rating', 'def_rating', 'net_rating',
+                 'proba', 'playoff_status', 'historical', 'trend')
+
+    def __init__(self, team, season, win_pct, off_rating, def_rating, net_rating,
+                 proba, playoff_status, historical=(), trend=None):
+        self.team = team
+        self.season = season
+        self.win_pct = win_pct
+        self.off_rating = off_rating
+        self.def_rating = def_rating
+        self.net_rating = net_rating
+        self.proba = proba
+        self.playoff_status = playoff_status
+        self.historical = historical
+        self.trend = trend
+
+    @property
+    def efficiency_pct(self):
+        return self.win_pct * 0.8
+
+    def to_json(self, normalized_scores, simulation=None):
+        """The dashboard team object (see the module docstring)."""
+        obj = {
+            "team": self.team,
+            "season": self.season,
+            "stats": {
+                "win_pct": self.win_pct,
+                "off_rating": self.off_rating,
+                "def_rating": self.def_rating,
+                "net_rating": self.net_rating,
+                "efficiency_pct": self.efficiency_pct
+            },
+            "playoff_status": self.playoff_status,
+            "historical": [h.to_json() for h in self.historical],
+            "trend": self.trend.to_json() if self.trend is not None else None,
+            "normalized_scores": normalized_scores
+        }
+        if simulation is not None:
+            obj["simulation"] = simulation
+        return obj
+
+    def to_row(self):
+        return [self.team, self.season, self.win_pct, self.off_rating, self.def_rating,
+                self.net_rating, self.proba, self.playoff_status,
+                [h.to_row() for h in self.historical],
+                self.trend.to_row() if self.trend is not None else None]
+
+    @classmethod
+    def from_row(cls, row):
+        team, season, *fields, history, trend = row
+        historical = tuple(HistoryEntry(sys.intern(h[0]), *h[1:]) for h in history)
+        return cls(sys.intern(team), sys.intern(season), *fields, historical,
+                   TeamTrend.from_row(trend) if trend is not None else None)
@@ -0,0 +1,127 @@
+"""
+==============================================================================
+NBA ORACLE — Batch Normalization & Overall-Rating Engine
+==============================================================================
+Purpose: Scores whole stat COLUMNS at once instead of normalizing one stat
+         of one team at a time inside the division loop.
+
+HOW IT WORKS:
+  1. compute_bounds()  → one min() and one max() per stat column
+  2. score_columns()   → min-max scales every column to 0-100, inverts the
+                         "lower is better" stats, and combines them into the
+                         weighted overall rating in a single pass
+
+CONFIGURATION:
+  Each scored stat is described by a ScoreSpec:
+
+    ScoreSpec(key="defensive_score", stat="def_rating",
+              weight=0.4, direction=LOWER_IS_BETTER)
+
+  DEFAULT_SCORE_SPECS reproduces the dashboard's 40/40/20 formula:
+    overall = (off_score × 0.4) + (def_score × 0.4) + (win_score × 0.2)
+
+EXACTNESS:
+  The arithmetic is kept in the same order as the original per-team code:
+    score     = ((value - min) / (max - min)) × 100
+    inverted  = 100 - score
+    overall   = Σ (score × weight)   (specs in order, left to right)
+  and an all-equal column (max == min) still scores 50 for every team, so
+  the rounded values the dashboard reads are unchanged.
+==============================================================================
+"""
+
+from collections import namedtuple
+
+
+HIGHER_IS_BETTER = 'higher'
+LOWER_IS_BETTER = 'lower'
+
+# key:       name of the score in "normalized_scores" (e.g. "offensive_score")
+# stat:      name of the raw stat in "stats" (e.g. "off_rating")
+# weight:    contribution to overall_rating
+# direction: HIGHER_IS_BETTER or LOWER_IS_BETTER (inverted: 100 - score)
+ScoreSpec = namedtuple('ScoreSpec', ['key', 'stat', 'weight', 'direction'])
+
+DEFAULT_SCORE_SPECS = (
+    ScoreSpec('offensive_score', 'off_rating', 0.4, HIGHER_IS_BETTER),
+    ScoreSpec('defensive_score', 'def_rating', 0.4, LOWER_IS_BETTER),
+    ScoreSpec('win_pct_score', 'win_pct', 0.2, HIGHER_IS_BETTER),
+)
+
+OVERALL_KEY = 'overall_rating'
+
+
+def with_weights(specs, weights):
+    """Returns a copy of specs with weights overridden by {stat: weight}."""
+    unknown = set(weights) - {s.stat for s in specs}
+    if unknown:
+        raise ValueError(f"Unknown stat(s) in weights: {', '.join(sorted(unknown))}")
+    return tuple(s._replace(weight=weights.get(s.stat, s.weight)) for s in specs)
+
+
+def stat_columns(teams, specs=DEFAULT_SCORE_SPECS):
+    """{stat: [value per team]} for every scored stat, aligned with teams."""
+    return {spec.stat: [getattr(t, spec.stat) for t in teams] for spec in specs}
+
+
+def compute_bounds(columns, specs=DEFAULT_SCORE_SPECS):
+    """Global (min, max) for every scored stat column: {stat: (min, max)}."""
+    bounds = {}
+    for spec in specs:
+        col = columns[spec.stat]
+        bounds[spec.stat] = (min(col), max(col))
+    return bounds
+
+
+def merge_bounds(a, b):
+    """Combines two {stat: (min, max)} maps (e.g. from different files)."""
+    merged = dict(a)
+    for stat, (lo, hi) in b.items():
+        if stat in merged:
+            old_lo, old_hi = merged[stat]
+            lo, hi = min(old_lo, lo), max(old_hi, hi)
+        merged[stat] = (lo, hi)
+    return merged
+
+
+def normalize_column(values, min_val, max_val):
+    """Min-Max scales a whole column to 0-100 (50 when max == min)."""
+    if max_val == min_val:
+        return [50] * len(values)
+    span = max_val - min_val
+    return [((v - min_val) / span) * 100 for v in values]
+
+
+def score_columns(columns, bounds, specs=DEFAULT_SCORE_SPECS):
+    """
+    Scores every team in one pass per stat.
+
+    Returns {score key: [unrounded scores]} plus OVERALL_KEY, each list
+    aligned with the input columns.
+    """
+    for spec in specs:
+        if spec.direction not in (HIGHER_IS_BETTER, LOWER_IS_BETTER):
+            raise ValueError(f"Invalid direction for {spec.stat}: {spec.direction!r}")
+
+    scores = {}
+    overall = None
+    for spec in specs:
+        lo, hi = bounds[spec.stat]
+        col = normalize_column(columns[spec.stat], lo, hi)
+        if spec.direction == LOWER_IS_BETTER:
+            col = [100 - v for v in col]
+        scores[spec.key] = col
+
+        weight = spec.weight
+        if overall is None:
+            overall = [v * weight for v in col]
+        else:
+            overall = [acc + v * weight for acc, v in zip(overall, col)]
+
+    scores[OVERALL_KEY] = overall if overall is not None else []
+    return scores
+
+
+def rounded_scores(scores, i):
+    """The "normalized_scores" JSON object for row i (rounded to 1 decimal)."""
+    return {key: round(col[i], 1) for key, col in scores.items()}
@@ -0,0 +1,469 @@
+"""
+==============================================================================
+NBA ORACLE — Raw Season Data Ingest & Binary Columnar Cache
+==============================================================================
+Purpose: Loads the raw training data (the same seasons the Azure ML model
+         was trained on) from csvnba/nbaData.xlsx or the per-division
+         csvnba/nba*.csv files ONCE, and keeps it in a memory-mappable
+         binary cache so later runs (and local feature engineering) start
+         almost instantly.
+
+SOURCES:
+  xlsx  csvnba/nbaData.xlsx, one sheet per division. Read with zipfile +
+        xml.etree (an .xlsx is a zip of XML files), no Excel library needed.
+  csv   csvnba/nbaAntlantic.csv, nbaCentral.csv, ... (RAW_CSV_FILES)
+
+  Required columns: Season, Team, Win_Pct, Off_Rating, Def_Rating,
+  MadePlayoffs. Extra columns (ThreeP_Pct, TS%, ...) are ignored.
+
+THE TABLE (SeasonTable), one row per team-season, grouped by division:
+    Column          Storage
+    season          array('H') codes  → table.seasons   (dictionary)
+    team            array('H') codes  → table.teams     (dictionary)
+    division        array('B') codes  → table.divisions (dictionary)
+    win_pct         array('d')
+    off_rating      array('d')
+    def_rating      array('d')
+    made_playoffs   array('b')  (1 / 0)
+
+  Strings are dictionary-encoded (Arrow-style), so every column is a flat
+  array of fixed-size numbers. table.division_rows("atlantic") is a range:
+  rows of a division are contiguous, and table.columns("atlantic") gives
+  that division's columns as zero-copy memoryview slices (valid until
+  table.close()).
+
+THE CACHE FILE (csvnba/.oracle_cache/season_data.<source>.<key>.bin):
+    b"NBACOLS1" | header length (uint64) | JSON header | column blobs
+  The JSON header holds the source hashes, dictionaries and each column's
+  typecode / offset / length. Blobs are 8-byte aligned and written with
+  array.tofile(). Loading mmaps the file and every column is a
+  memoryview.cast() slice of that map, so nothing is parsed or copied.
+
+  The key is the SHA-256 of the source files (+ CACHE_FORMAT), so editing
+  the workbook or a CSV invalidates the cache automatically.
+
+USAGE:
+  with load_season_data() as table:        # xlsx by default, cached
+      for i in table.division_rows("pacific"):
+          table.team_name(i), table.win_pct[i]
+  python process/season_data.py --source csv   (build/refresh + summary)
+
+  Standalone on purpose: process_predictions.py reads the Azure ML
+  prediction CSVs, which already carry every season (history included)
+  next to the model output. This cache serves local feature engineering
+  on the raw sheets the model was trained on.
+==============================================================================
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zipfile
+from array import array
+from xml.etree import ElementTree
+
+from build_cache import file_sha256
+from prediction_columns import SchemaError, check_header
+from publish import atomic_write
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_FOLDER = os.path.join(REPO_ROOT, 'csvnba')
+RAW_XLSX = os.path.join(RAW_FOLDER, 'nbaData.xlsx')
+CACHE_DIR = os.path.join(RAW_FOLDER, '.oracle_cache')
+
+# Division key → per-division CSV (same order as the prediction CSVs)
+RAW_CSV_FILES = {
+    'atlantic': 'nbaAntlantic.csv',
+    'central': 'nbaCentral.csv',
+    'southeast': 'nbaSoutheast.csv',
+    'northwest': 'nbaNorthwest.csv',
+    'pacific': 'nbaPacific.csv',
+    'southwest': 'nbaSouthwest.csv',
+}
+
+# Workbook sheet names that are not just the lower-cased division key
+XLSX_SHEET_DIVISIONS = {'antlantic': 'atlantic'}
+
+# Required column → SeasonTable column
+RAW_SCHEMA = {
+    'Season': 'season',
+    'Team': 'team',
+    'Win_Pct': 'win_pct',
+    'Off_Rating': 'off_rating',
+    'Def_Rating': 'def_rating',
+    'MadePlayoffs': 'made_playoffs',
+}
+
+
+class SeasonDataSchemaError(SchemaError):
+    """Raised when a raw season sheet / CSV is missing required columns or has a bad row."""
+
+
+# (column, typecode) in file order; bump CACHE_FORMAT when this changes
+COLUMNS = (
+    ('season', 'H'), ('team', 'H'), ('division', 'B'),
+    ('win_pct', 'd'), ('off_rating', 'd'), ('def_rating', 'd'), ('made_playoffs', 'b'),
+)
+CACHE_FORMAT = 1
+MAGIC = b'NBACOLS1'
+ALIGN = 8
+
+
+# =============================================================================
+# STEP 1: READING THE SOURCES (rows of strings, header first)
+# =============================================================================
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _column_index(cell_ref):
+    """"C12" → 2 (zero-based column of an A1-style reference)."""
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+
+def _shared_strings(zf):
+    try:
+        data = zf.read('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    root = ElementTree.fromstring(data)
+    # A shared string may be split into rich-text runs (<r><t>..</t></r>)
+    return [''.join(t.text or '' for t in si.iter(f'{_NS}t')) for si in root.iter(f'{_NS}si')]
+
+
+def _sheet_rows(zf, member, strings):
+    """Yields each row of one worksheet as a list of cell strings."""
+    with zf.open(member) as f:
+        for _, row in ElementTree.iterparse(f):
+            if row.tag != f'{_NS}row':
+                continue
+            values = []
+            for c in row.iter(f'{_NS}c'):
+                kind = c.get('t')
+                if kind == 'inlineStr':
+                    text = ''.join(t.text or '' for t in c.iter(f'{_NS}t'))
+                else:
+                    v = c.find(f'{_NS}v')
+                    text = '' if v is None or v.text is None else v.text
+                    if kind == 's':
+                        text = strings[int(text)]
+                col = _column_index(c.get('r', '')) if c.get('r') else len(values)
+                values.extend([''] * (col - len(values)))  # Empty cells are omitted
+                values.append(text)
+            row.clear()
+            yield values
+
+
+def read_xlsx(path):
+    """[(sheet name, rows)] for every worksheet, in workbook order."""
+    with zipfile.ZipFile(path) as zf:
+        strings = _shared_strings(zf)
+        workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        targets = {r.get('Id'): r.get('Target') for r in rels.iter(f'{_PKG_REL_NS}Relationship')}
+        sheets = []
+        for sheet in workbook.iter(f'{_NS}sheet'):
+            target = targets[sheet.get(f'{_REL_NS}id')].lstrip('/')
+            member = target if target.startswith('xl/') else f'xl/{target}'
+            sheets.append((sheet.get('name'), list(_sheet_rows(zf, member, strings))))
+        return sheets
+
+
+def read_csv(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def xlsx_division(sheet_name):
+    key = sheet_name.strip().lower()
+    return XLSX_SHEET_DIVISIONS.get(key, key)
+
+
+# =============================================================================
+# STEP 2: THE COLUMNAR TABLE
+# =============================================================================
+class SeasonTable:
+    """Dictionary-encoded columns of raw team-seasons (see module docstring)."""
+
+    __slots__ = ('key', 'sources', 'seasons', 'teams', 'divisions', 'division_ranges',
+                 'season', 'team', 'division', 'win_pct', 'off_rating', 'def_rating',
+                 'made_playoffs', '_mmap', '_layout', '_mapped', '_views')
+
+    def __init__(self, key=None, sources=()):
+        self.key = key
+        self.sources = list(sources)
+        self.seasons, self.teams, self.divisions = [], [], []
+        self.division_ranges = {}  # division → (start, stop)
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self._mmap = None
+        self._layout = None  # (data offset, header["columns"]) of a mapped table
+        self._mapped = []    # memoryviews into the map backing the columns
+        self._views = []     # memoryviews handed out by columns()
+
+    def __len__(self):
+        return len(self.win_pct)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def season_name(self, i):
+        return self.seasons[self.season[i]]
+
+    def team_name(self, i):
+        return self.teams[self.team[i]]
+
+    def division_rows(self, division):
+        return range(*self.division_ranges[division])
+
+    def columns(self, division=None):
+        """
+        {column name: memoryview}, aligned by row (one division's slice if given).
+
+        The views share the table's memory (nothing is copied) and are
+        released by close(): use them inside the `with` block, or copy what
+        must outlive it (e.g. list(view)).
+        """
+        rows = slice(*self.division_ranges[division]) if division else slice(None)
+        cols = {}
+        for name, _ in COLUMNS:
+            col = getattr(self, name)
+            if not isinstance(col, memoryview):  # Parsed (not cached) table
+                col = memoryview(col)
+                self._views.append(col)
+            cols[name] = col[rows]
+            self._views.append(cols[name])
+        return cols
+
+    def _map_columns(self, mm, offset, layout):
+        """Points every column at its blob in mm (zero-copy memoryview casts)."""
+        data = memoryview(mm)[offset:]
+        self._mapped = [data]
+        for entry in layout:
+            view = data[entry["offset"]:entry["offset"] + entry["bytes"]].cast(entry["typecode"])
+            self._mapped.append(view)
+            setattr(self, entry["name"], view)
+        self._mmap, self._layout = mm, (offset, layout)
+
+    def close(self):
+        """
+        Releases every view handed out by columns() and the memory map.
+
+        A slice taken from a column (e.g. table.win_pct[0:3]) also pins the
+        map; if one is still alive, BufferError is raised and the table stays
+        open and usable (columns() views already handed out are released).
+        """
+        # Newest first: slices before the views they were taken from
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is None:
+            return
+        for view in reversed(self._mapped):
+            view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            self._map_columns(self._mmap, *self._layout)
+            raise BufferError("SeasonTable.close(): a slice of a column is still in use; "
+                              "release it (view.release()) or copy it before closing") from None
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self._mapped = []
+        self._mmap = self._layout = None
+
+
+def _encoder(values):
+    codes = {}
+
+    def encode(value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(sys.intern(value))
+        return code
+    return encode
+
+
+def build_table(divisions, key=None, sources=()):
+    """SeasonTable from [(division key, rows, source name)] (rows: header first)."""
+    table = SeasonTable(key, sources)
+    season_code, team_code = _encoder(table.seasons), _encoder(table.teams)
+    for div_key, rows, source in divisions:
+        rows = iter(rows)
+        header = [h.strip() for h in next(rows, [])]
+        idx = check_header(header, source, RAW_SCHEMA, SeasonDataSchemaError)
+        if div_key not in table.divisions:
+            table.divisions.append(div_key)
+        div_code = table.divisions.index(div_key)
+        start = len(table)
+        for line_no, row in enumerate(rows, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                win = float(row[idx['Win_Pct']])
+                off = float(row[idx['Off_Rating']])
+                dfn = float(row[idx['Def_Rating']])
+                made = 1 if int(float(row[idx['MadePlayoffs']])) == 1 else 0
+                season, team = row[idx['Season']].strip(), row[idx['Team']].strip()
+            except (ValueError, IndexError) as exc:
+                raise SeasonDataSchemaError(f"{source} row {line_no}: {exc}") from exc
+            table.season.append(season_code(season))
+            table.team.append(team_code(team))
+            table.division.append(div_code)
+            table.win_pct.append(win)
+            table.off_rating.append(off)
+            table.def_rating.append(dfn)
+            table.made_playoffs.append(made)
+        table.division_ranges[div_key] = (start, len(table))
+    return table
+
+
+# =============================================================================
+# STEP 3: THE BINARY CACHE
+# =============================================================================
+def _padding(n):
+    return -n % ALIGN
+
+
+def write_table(table, path):
+    """Writes the cache file (atomically): magic, header, aligned column blobs."""
+    layout, offset = [], 0
+    for name, typecode in COLUMNS:
+        nbytes = len(getattr(table, name)) * array(typecode).itemsize
+        layout.append({"name": name, "typecode": typecode, "offset": offset, "bytes": nbytes})
+        offset += nbytes + _padding(nbytes)
+    header = json.dumps({
+        "format": CACHE_FORMAT,
+        "key": table.key,
+        "sources": table.sources,
+        "byteorder": sys.byteorder,
+        "rows": len(table),
+        "seasons": table.seasons,
+        "teams": table.teams,
+        "divisions": table.divisions,
+        "division_ranges": table.division_ranges,
+        "columns": layout,
+    }).encode('utf-8')
+    header += b' ' * _padding(len(MAGIC) + 8 + len(header))
+
+    with atomic_write(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for entry in layout:
+            getattr(table, entry["name"]).tofile(f)
+            f.write(b'\0' * _padding(entry["bytes"]))
+
+
+def open_table(path):
+    """Maps a cache file; every column is a zero-copy memoryview into the map."""
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a season data cache")
+        (header_len,) = struct.unpack_from('<Q', mm, len(MAGIC))
+        base = len(MAGIC) + 8
+        header = json.loads(mm[base:base + header_len])
+        if header["format"] != CACHE_FORMAT or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written by another cache format or platform")
+
+        table = SeasonTable(header["key"], header["sources"])
+        table.seasons = [sys.intern(s) for s in header["seasons"]]
+        table.teams = [sys.intern(t) for t in header["teams"]]
+        table.divisions = header["divisions"]
+        table.division_ranges = {k: tuple(v) for k, v in header["division_ranges"].items()}
+        table._map_columns(mm, base + header_len, header["columns"])
+        return table
+    except Exception:
+        mm.close()
+        raise
+
+
+def _source_paths(source, raw_folder, xlsx_path, csv_files):
+    if source == 'xlsx':
+        return [xlsx_path]
+    if source == 'csv':
+        return [os.path.join(raw_folder, name) for name in csv_files.values()]
+    raise ValueError(f"Unknown season data source: {source!r} (expected 'xlsx' or 'csv')")
+
+
+def load_season_data(source='xlsx', raw_folder=RAW_FOLDER, xlsx_path=RAW_XLSX,
+                     csv_files=RAW_CSV_FILES, cache_dir=CACHE_DIR, use_cache=True):
+    """
+    SeasonTable for the raw data, from the binary cache when it is current.
+
+    The cache key covers the bytes of every source file, so a changed
+    workbook / CSV is re-parsed and the cache rewritten; older cache files
+    for the same source are removed.
+    """
+    paths = _source_paths(source, raw_folder, xlsx_path, csv_files)
+    hashes = [(os.path.basename(p), file_sha256(p)) for p in paths]
+    key = hashlib.sha256(json.dumps([CACHE_FORMAT, source, hashes]).encode('utf-8')).hexdigest()
+    cache_path = os.path.join(cache_dir, f'season_data.{source}.{key[:16]}.bin')
+
+    if use_cache and os.path.exists(cache_path):
+        try:
+            table = open_table(cache_path)
+            if table.key == key:
+                return table
+            table.close()
+        except (OSError, ValueError, KeyError):
+            pass  # Unreadable cache → rebuild it below
+
+    if source == 'xlsx':
+        divisions = [(xlsx_division(name), rows, f"{os.path.basename(xlsx_path)}[{name}]")
+                     for name, rows in read_xlsx(xlsx_path)]
+    else:
+        divisions = [(div_key, read_csv(path), path)
+                     for div_key, path in zip(csv_files, paths)]
+    table = build_table(divisions, key, [{"file": name, "sha256": h} for name, h in hashes])
+
+    if use_cache:
+        write_table(table, cache_path)
+        prefix = f'season_data.{source}.'
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name != os.path.basename(cache_path):
+                os.remove(os.path.join(cache_dir, name))
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build / refresh the raw season data cache.")
+    parser.add_argument('--source', choices=['xlsx', 'csv'], default='xlsx',
+                        help="read csvnba/nbaData.xlsx or the per-division CSVs (default: %(default)s)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="cache location (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="parse the sources, ignore the cache")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with load_season_data(args.source, cache_dir=args.cache_dir, use_cache=not args.no_cache) as table:
+        elapsed = time.perf_counter() - start
+        print(f"{len(table)} team-seasons, {len(table.teams)} teams, {len(table.seasons)} seasons, "
+              f"{len(table.divisions)} divisions in {elapsed * 1000:.1f} ms "
+              f"({'memory-mapped cache' if table._mmap is not None else 'parsed'})")
+        for div_key in table.divisions:
+            rows = table.division_rows(div_key)
+            print(f"  {div_key:10s} rows {rows.start}-{rows.stop - 1}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
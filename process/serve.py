@@ -0,0 +1,293 @@
+"""
+==============================================================================
+NBA ORACLE — Local Query Server
+==============================================================================
+Purpose: Serves small slices of the built dashboard data over HTTP, so a
+         team card fetches a few hundred bytes instead of the whole
+         azure_predictions.json. Runs fully offline (standard library only).
+
+ENDPOINTS (JSON):
+  GET /                              index: meta, divisions, team → division
+  GET /teams/{id}                    one team incl. history ("BOS" or "boston-celtics");
+                                     409 if the alias names more than one team
+  GET /divisions/{key}               standings for one division (no history)
+  GET /divisions/{key}/analytics     division_analytics only
+  GET /matchup?home=BOS&away=NYK     one game from matchup_matrix.json
+
+  The slices are the same objects as the sharded output (shards.py).
+
+  A build in which two teams share an ID or shard (teams.TeamIdCollision)
+  is refused: the previous build keeps being served, or, with none, every
+  request gets 409 naming the two teams.
+
+CACHING:
+  - The model is loaded ONCE and every response body (plus its gzip form
+    and ETag) is built in memory; matchup answers are memoized on first use.
+  - Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+  - Clients sending "Accept-Encoding: gzip" get the precompressed body.
+  - Before answering, the server stats the output files. When a rebuild
+    replaced them (process_predictions.py, possibly in --watch mode), the
+    model and every cached response are rebuilt from the new files.
+
+CONCURRENCY:
+  ThreadingHTTPServer: one thread per connection. Requests only read the
+  current model; a reload builds a new one and swaps the reference.
+
+USAGE:
+  python process/serve.py --port 8000
+  python process/serve.py --output build/azure_predictions.json --host 0.0.0.0
+==============================================================================
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from instrument import configure_logging
+from matchups import MatchupMatrix
+from process_predictions import OUTPUT_PATH
+from shards import INDEX_NAME, build_shards
+from teams import TeamIdCollision, team_slug
+
+
+log = logging.getLogger('serve')
+
+# Bodies smaller than this are sent uncompressed (gzip would not pay off)
+GZIP_MIN_BYTES = 256
+
+Response = namedtuple('Response', ['body', 'gzip_body', 'etag'])
+
+
+def make_response(obj):
+    """Compact JSON body + gzip form + ETag, built once per cached object."""
+    body = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    gz = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return Response(body, gz, '"' + hashlib.sha256(body).hexdigest()[:20] + '"')
+
+
+def _signature(paths):
+    """(mtime_ns, size) per file; changes whenever a rebuild replaces one."""
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            sig.append(None)
+        else:
+            sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+class Model:
+    """Every response for one build of the outputs, keyed by URL path."""
+
+    def __init__(self, predictions_path, matchups_path, signature):
+        self.signature = signature
+        with open(predictions_path, 'r', encoding='utf-8') as f:
+            final_data = json.load(f)
+
+        shards = build_shards(final_data)
+        index = shards[INDEX_NAME]
+        self.responses = {'/': make_response(index)}
+        for div_key in index["divisions"]:
+            division = shards[f'divisions/{div_key}.json']
+            self.responses[f'/divisions/{div_key}'] = make_response(division)
+            self.responses[f'/divisions/{div_key}/analytics'] = make_response(
+                division["division_analytics"])
+        # IDs are unique per build (teams.unique_team_ids), but the lower-cased
+        # ID of one team may still equal another team's slug: such an alias
+        # answers 409 with the candidates instead of picking one silently.
+        owners = {}  # team path → [team IDs it could mean]
+        for team_id, entry in index["teams"].items():
+            response = make_response(shards[entry["shard"]])
+            for path in {f'/teams/{team_id.lower()}', f'/teams/{team_slug(entry["name"])}'}:
+                owners.setdefault(path, []).append(team_id)
+                self.responses.setdefault(path, response)
+        self.ambiguous = {}
+        for path, ids in owners.items():
+            if len(ids) > 1:
+                del self.responses[path]
+                self.ambiguous[path] = make_response(
+                    {"error": f"ambiguous team: {path.rsplit('/', 1)[1]}", "candidates": ids})
+
+        self.matchups = None
+        if matchups_path and os.path.exists(matchups_path):
+            self.matchups = MatchupMatrix.load(matchups_path)
+        self._matchup_cache = {}
+
+    def matchup(self, home, away):
+        """Memoized MatchupMatrix.lookup() response (KeyError / ValueError pass through)."""
+        # IDs are case-insensitive ("bos"); full names are matched as given
+        index = self.matchups.index
+        home = home if home in index else home.upper()
+        away = away if away in index else away.upper()
+        key = (home, away)
+        response = self._matchup_cache.get(key)
+        if response is None:
+            response = make_response(self.matchups.lookup(home, away))
+            self._matchup_cache[key] = response
+        return response
+
+
+class ModelStore:
+    """Holds the current Model and rebuilds it when the output files change."""
+
+    def __init__(self, predictions_path, matchups_path=None):
+        self.paths = [p for p in (predictions_path, matchups_path) if p]
+        self.predictions_path = predictions_path
+        self.matchups_path = matchups_path
+        self._model = None
+        self._lock = threading.Lock()
+        self.error = None    # Why the newest outputs could not be loaded
+        self._failed = None  # ... and their signature (not retried until they change)
+
+    def current(self):
+        """The up-to-date Model, or None if the outputs are not built yet."""
+        signature = _signature(self.paths)
+        model = self._model
+        if model is not None and model.signature == signature:
+            return model
+        if signature[0] is None or signature == self._failed:
+            return model  # Keep serving the last good build until a new one appears
+        with self._lock:
+            if (self._model is None or self._model.signature != signature) and signature != self._failed:
+                try:
+                    self._model = Model(self.predictions_path, self.matchups_path, signature)
+                    self.error = self._failed = None
+                    log.info("Loaded %s", self.predictions_path)
+                except (OSError, ValueError, KeyError) as exc:
+                    self.error, self._failed = exc, signature
+                    log.error("Could not load %s: %s", self.predictions_path, exc)
+            return self._model
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """GET / HEAD handler; the ModelStore is attached to the server."""
+
+    server_version = "NBAOracle/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _route(self, model):
+        """(status, Response) for the request path."""
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/').lower() or '/'
+        if path == '/matchup':
+            if model.matchups is None:
+                return 404, make_response({"error": "matchup matrix not built"})
+            query = parse_qs(url.query)
+            home, away = query.get('home', [''])[0], query.get('away', [''])[0]
+            if not home or not away:
+                return 400, make_response({"error": "matchup needs ?home=&away="})
+            try:
+                return 200, model.matchup(home, away)
+            except KeyError as exc:
+                return 404, make_response({"error": str(exc.args[0])})
+            except ValueError as exc:
+                return 400, make_response({"error": str(exc)})
+        if path in model.ambiguous:
+            return 409, model.ambiguous[path]
+        response = model.responses.get(path)
+        if response is None:
+            return 404, make_response({"error": f"no such resource: {url.path}"})
+        return 200, response
+
+    def _respond(self, send_body):
+        store = self.server.store
+        model = store.current()
+        if model is None and isinstance(store.error, TeamIdCollision):
+            status, response = 409, make_response({"error": str(store.error)})
+        elif model is None:
+            status, response = 503, make_response({"error": "outputs not built yet"})
+        else:
+            status, response = self._route(model)
+
+        if status == 200 and self._etag_matches(response.etag):
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = response.body
+        gzipped = (response.gzip_body is not None
+                   and 'gzip' in self.headers.get('Accept-Encoding', ''))
+        if gzipped:
+            body = response.gzip_body
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', response.etag)
+        self.send_header('Cache-Control', 'no-cache')  # Always revalidate via ETag
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _etag_matches(self, etag):
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        tags = [t.strip().removeprefix('W/') for t in header.split(',')]
+        return '*' in tags or etag in tags
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(store, host='127.0.0.1', port=8000):
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Serve team / division / matchup slices of the built dashboard data.")
+    parser.add_argument('-o', '--output', default=OUTPUT_PATH,
+                        help="azure_predictions.json to serve (default: %(default)s)")
+    parser.add_argument('--matchups', metavar='PATH',
+                        help="matchup matrix (default: matchup_matrix.json next to --output)")
+    parser.add_argument('--host', default='127.0.0.1', help="bind address (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=8000, help="port (default: %(default)s)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="log reloads (-v) and every request (-vv)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    configure_logging(args.verbose)
+    matchups_path = args.matchups or os.path.join(os.path.dirname(args.output), 'matchup_matrix.json')
+
+    store = ModelStore(args.output, matchups_path)
+    store.current()  # Load up front so the first request is fast
+    server = make_server(store, args.host, args.port)
+    print(f"Serving {args.output} on http://{args.host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
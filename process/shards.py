@@ -0,0 +1,165 @@
+"""
+==============================================================================
+NBA ORACLE — Sharded, Precompressed Dashboard Output
+==============================================================================
+Purpose: Splits the dashboard payload into small files so the browser only
+         downloads what it renders, and caches whatever did not change.
+
+LAYOUT (all JSON written compact, no indentation):
+
+  <shard dir>/
+    index.json                 ← meta + division list + team → shard map
+    divisions/atlantic.json    ← standings for one division (no history)
+    teams/boston-celtics.json  ← one team, including its full "historical"
+    manifest.json              ← sha256 / size of every shard (cache-busting)
+
+  Every shard also gets precompressed siblings:
+    index.json.gz  (always — gzip is in the standard library)
+    index.json.br  (OPTIONAL: only when the "brotli" package is installed,
+                    pip install brotli; without it only .gz is written)
+
+  Teams are keyed by teams.unique_team_ids(), so two teams can never share
+  an index entry or a team shard: a build where they would fails instead.
+
+INCREMENTAL:
+  A shard whose content hash matches the previous manifest is not rewritten,
+  and shards that disappeared from the data are deleted.
+==============================================================================
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from publish import atomic_write
+from teams import TeamIdCollision, team_slug, unique_team_ids
+
+try:
+    import brotli
+except ImportError:  # Optional: .br siblings are skipped without it
+    brotli = None
+
+
+log = logging.getLogger('shards')
+
+MANIFEST_NAME = 'manifest.json'
+INDEX_NAME = 'index.json'
+
+
+def _compact(obj):
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def build_shards(final_data):
+    """{relative path: JSON-ready object} for every shard except the manifest."""
+    shards = {}
+    index = {"meta": final_data["meta"], "divisions": {}, "teams": {}}
+    names = [t["team"] for d in final_data["divisions"].values() for t in d["teams"]]
+    ids = iter(unique_team_ids(names))
+
+    for div_key, division in final_data["divisions"].items():
+        div_path = f'divisions/{div_key}.json'
+        standings = []
+        for team in division["teams"]:
+            team_path = f'teams/{team_slug(team["team"])}.json'
+            if team_path in shards:
+                raise TeamIdCollision(f"{shards[team_path]['team']!r} and {team['team']!r} "
+                                      f"would share the shard {team_path}")
+            shards[team_path] = team
+            # Division shards carry everything except the (large) history
+            summary = {k: v for k, v in team.items() if k != "historical"}
+            summary["id"] = next(ids)
+            summary["shard"] = team_path
+            standings.append(summary)
+            index["teams"][summary["id"]] = {"name": team["team"], "division": div_key,
+                                             "shard": team_path}
+
+        shards[div_path] = {
+            "name": division["name"],
+            "conference": division["conference"],
+            "teams": standings,
+            "division_analytics": division["division_analytics"],
+        }
+        index["divisions"][div_key] = {
+            "name": division["name"],
+            "conference": division["conference"],
+            "shard": div_path,
+        }
+
+    shards[INDEX_NAME] = index
+    return shards
+
+
+def _load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def _shard_files(path, entry):
+    """The shard itself plus its precompressed siblings (path.gz, path.br)."""
+    return [path] + [f"{path}.{ext}" for ext in entry.get("encodings", {})]
+
+
+def _write_bytes(path, data):
+    with atomic_write(path, 'wb') as f:
+        f.write(data)
+
+
+def write_sharded_output(final_data, shard_dir):
+    """
+    Writes index / division / team shards (+ .gz / .br) and the manifest.
+
+    Returns (manifest, written) where written lists the shards whose
+    content actually changed.
+    """
+    manifest_path = os.path.join(shard_dir, MANIFEST_NAME)
+    previous = _load_manifest(manifest_path)["files"]
+
+    wanted = {"gz", "br"} if brotli is not None else {"gz"}
+    if brotli is None:
+        log.info("brotli is not installed: writing .gz siblings only (pip install brotli for .br)")
+    files = {}
+    written = []
+    for rel_path, obj in build_shards(final_data).items():
+        data = _compact(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        entry = {"sha256": digest, "bytes": len(data)}
+        path = os.path.join(shard_dir, rel_path)
+
+        old = previous.get(rel_path)
+        if (old is not None and old.get("sha256") == digest
+                and set(old.get("encodings", {})) >= wanted
+                and all(os.path.exists(p) for p in _shard_files(path, old))):
+            files[rel_path] = old
+            continue
+
+        encodings = {}
+        _write_bytes(path, data)
+        # mtime=0 keeps the .gz bytes identical for identical content
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        _write_bytes(path + '.gz', gz)
+        encodings["gz"] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            _write_bytes(path + '.br', br)
+            encodings["br"] = len(br)
+        entry["encodings"] = encodings
+        files[rel_path] = entry
+        written.append(rel_path)
+
+    # Remove shards that no longer exist in the data (e.g. a team moved out)
+    for rel_path, old in previous.items():
+        if rel_path in files:
+            continue
+        for stale in _shard_files(os.path.join(shard_dir, rel_path), old):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    manifest = {"files": dict(sorted(files.items()))}
+    _write_bytes(manifest_path, _compact(manifest))
+    return manifest, written
@@ -0,0 +1,231 @@
+"""
+==============================================================================
+NBA ORACLE — Monte Carlo Season & Playoff Simulator
+==============================================================================
+Purpose: Turns per-game win probabilities into playoff ODDS by playing the
+         rest of the season and the playoff bracket thousands of times.
+         This complements the 0.8 / 0.2 thresholds on 1_predicted_proba
+         (clinched / eliminated / contender) with real percentages.
+
+HOW ONE SIMULATION WORKS:
+  1. Start from each team's current record:
+       wins_so_far = round(win_pct × games_played)
+  2. Play the remaining schedule. Every game is one random draw against the
+     home win probability from the matchup engine (matchups.py).
+  3. Seed each conference by wins (random tiebreak).
+  4. Play-in: 7 vs 8 → winner is the 7 seed; loser vs winner of 9 vs 10 →
+     8 seed (single games, better seed at home).
+  5. Bracket per conference: 1v8, 4v5, 3v6, 2v7 → semis → conference finals,
+     then the NBA Finals between the two conference champions.
+     A best-of-7 series is ONE draw against the series win probability:
+       P(series) = Σ_{k=0..3} C(3+k, k) × p⁴ × (1-p)ᵏ
+     where p averages 4 home games and 3 road games for the higher seed.
+
+REMAINING SCHEDULE:
+  The CSVs do not contain the real schedule, so a balanced round-robin
+  rotation (every team plays once per round, alternating home/away) stands
+  in for the remaining games.
+
+SPEED & REPRODUCIBILITY:
+  - Series probabilities and per-game probabilities are precomputed once,
+    so each simulation is just table lookups and random() comparisons.
+  - Simulations run in fixed-size SHARDS spread over a process pool. Shard k
+    always uses seed (seed, k), so results are identical for any number of
+    workers.
+==============================================================================
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+
+SEASON_GAMES = 82
+SHARD_SIZE = 5000
+PLAYOFF_SEEDS = 8
+PLAY_IN_SEEDS = 10
+
+
+def series_win_prob(p, wins_needed=4):
+    """Probability of winning a best-of-(2n-1) series with per-game probability p."""
+    q = 1 - p
+    n = wins_needed
+    return sum(comb(n - 1 + k, k) * p ** n * q ** k for k in range(n))
+
+
+def round_robin_schedule(n_teams, n_rounds):
+    """
+    [(home, away), ...] for n_rounds rounds of the circle method.
+
+    Every team plays once per round (one team sits out when n_teams is odd);
+    home/away alternates between rounds.
+    """
+    slots = list(range(n_teams)) + ([None] if n_teams % 2 else [])
+    size = len(slots)
+    games = []
+    for r in range(n_rounds):
+        for k in range(size // 2):
+            a, b = slots[k], slots[size - 1 - k]
+            if a is None or b is None:
+                continue
+            games.append((a, b) if (r + k) % 2 == 0 else (b, a))
+        slots = [slots[0]] + [slots[-1]] + slots[1:-1]  # rotate all but the first
+    return games
+
+
+def _series_table(home_prob):
+    """series[i][j] = P(i beats j in a best-of-7 with home court for i)."""
+    n = len(home_prob)
+    table = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                p = (4 * home_prob[i][j] + 3 * (1 - home_prob[j][i])) / 7
+                table[i][j] = series_win_prob(p)
+    return table
+
+
+def _run_shard(args):
+    """Plays n_sims seasons + playoffs; returns per-team counters."""
+    (seed, shard, n_sims, base_wins, games, home_prob, series, conferences) = args
+    rng = random.Random(f"{seed}:{shard}")
+    rand = rng.random
+    n = len(base_wins)
+
+    game_probs = [(h, a, home_prob[h][a]) for h, a in games]
+    max_seed = max(len(c) for c in conferences)
+    seed_counts = [[0] * max_seed for _ in range(n)]
+    playoffs = [0] * n
+    conf_finals = [0] * n
+    finals = [0] * n
+    titles = [0] * n
+    total_wins = [0] * n
+
+    def play_game(home, away):
+        return home if rand() < home_prob[home][away] else away
+
+    def play_series(a, b, wins):
+        # Better record gets home court
+        hi, lo = (a, b) if (wins[a], -a) >= (wins[b], -b) else (b, a)
+        return hi if rand() < series[hi][lo] else lo
+
+    for _ in range(n_sims):
+        wins = base_wins[:]
+        for h, a, p in game_probs:
+            if rand() < p:
+                wins[h] += 1
+            else:
+                wins[a] += 1
+        for i in range(n):
+            total_wins[i] += wins[i]
+
+        champions = []
+        for members in conferences:
+            order = sorted(members, key=lambda t: (wins[t], rand()), reverse=True)
+            for s, t in enumerate(order):
+                seed_counts[t][s] += 1
+
+            seeds = order[:PLAYOFF_SEEDS]
+            if len(order) >= PLAY_IN_SEEDS:
+                s7, s8, s9, s10 = order[6:10]
+                first = play_game(s7, s8)
+                loser = s8 if first == s7 else s7
+                second = play_game(loser, play_game(s9, s10))
+                seeds = order[:6] + [first, second]
+            for t in seeds:
+                playoffs[t] += 1
+
+            # 1v8, 4v5, 3v6, 2v7 → semis → conference finals
+            top = play_series(play_series(seeds[0], seeds[7], wins),
+                              play_series(seeds[3], seeds[4], wins), wins)
+            bottom = play_series(play_series(seeds[2], seeds[5], wins),
+                                 play_series(seeds[1], seeds[6], wins), wins)
+            conf_finals[top] += 1
+            conf_finals[bottom] += 1
+            champ = play_series(top, bottom, wins)
+            finals[champ] += 1
+            champions.append(champ)
+
+        if len(champions) == 2:
+            titles[play_series(champions[0], champions[1], wins)] += 1
+        elif len(champions) == 1:
+            titles[champions[0]] += 1
+
+    return {
+        "seed_counts": seed_counts,
+        "playoffs": playoffs,
+        "conf_finals": conf_finals,
+        "finals": finals,
+        "titles": titles,
+        "total_wins": total_wins,
+    }
+
+
+class SimulationError(ValueError):
+    """Raised when the league or the arguments cannot be simulated."""
+
+
+def simulate_season(win_pct, conferences, home_prob, n_sims=100000, seed=0,
+                    games_played=55, season_games=SEASON_GAMES, workers=1):
+    """
+    Monte Carlo playoff odds.
+
+    win_pct:     current win% per team (index = team)
+    conferences: [[team indices], ...] (one list per conference)
+    home_prob:   N×N home win probabilities (matchups.home_win_matrix)
+
+    Returns one dict per team with seed / playoff / conference-finals /
+    finals / title probabilities and expected wins.
+    """
+    n = len(win_pct)
+    if n_sims <= 0:
+        raise SimulationError(f"n_sims must be positive, got {n_sims}")
+    for members in conferences:
+        if len(members) < PLAYOFF_SEEDS:
+            raise SimulationError(
+                f"Each conference needs at least {PLAYOFF_SEEDS} teams to seed a bracket "
+                f"(one has {len(members)})")
+    if not 0 <= games_played <= season_games:
+        raise SimulationError(f"games_played must be between 0 and {season_games}, got {games_played}")
+
+    base_wins = [round(w * games_played) for w in win_pct]
+    games = round_robin_schedule(n, season_games - games_played)
+    series = _series_table(home_prob)
+
+    shards = []
+    remaining, shard = n_sims, 0
+    while remaining > 0:
+        size = min(SHARD_SIZE, remaining)
+        shards.append((seed, shard, size, base_wins, games, home_prob, series, conferences))
+        remaining -= size
+        shard += 1
+
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            results = list(pool.map(_run_shard, shards))
+    else:
+        results = [_run_shard(s) for s in shards]
+
+    # Merge shard counters in shard order (deterministic)
+    totals = results[0]
+    for result in results[1:]:
+        for key, counts in result.items():
+            if key == "seed_counts":
+                for row, add in zip(totals[key], counts):
+                    for s, c in enumerate(add):
+                        row[s] += c
+            else:
+                totals[key] = [a + b for a, b in zip(totals[key], counts)]
+
+    conf_size = {t: len(members) for members in conferences for t in members}
+    summary = []
+    for t in range(n):
+        summary.append({
+            "seed_probs": [round(c / n_sims, 4) for c in totals["seed_counts"][t][:conf_size.get(t, 0)]],
+            "playoff_prob": round(totals["playoffs"][t] / n_sims, 4),
+            "conf_finals_prob": round(totals["conf_finals"][t] / n_sims, 4),
+            "finals_prob": round(totals["finals"][t] / n_sims, 4),
+            "title_prob": round(totals["titles"][t] / n_sims, 4),
+            "expected_wins": round(totals["total_wins"][t] / n_sims, 1),
+        })
+    return summary
@@ -0,0 +1,115 @@
+"""
+==============================================================================
+NBA ORACLE — Incremental JSON / NDJSON Writers (streaming mode)
+==============================================================================
+Purpose: Writes the dashboard JSON while it is still being produced, so
+         process_predictions.py --stream never holds the whole output.
+
+JSON (write_json_stream):
+  Produces EXACTLY the bytes json.dump(obj, f, indent=2) would, but any
+  part of the document may be lazy:
+    - StreamedObject(pairs)  → a JSON object whose (key, value) pairs come
+                               from an iterator (e.g. one division at a time)
+    - any other iterator     → a JSON array (e.g. one team at a time)
+  Plain dicts / lists / numbers / strings are encoded with json.dumps() as
+  usual. Only the value currently being written is in memory.
+
+NDJSON (write_ndjson_stream):
+  One compact JSON object per line, each tagged with "record":
+    {"record": "meta", "meta": {...}}
+    {"record": "division", "key": "atlantic", "name": ..., "conference": ...,
+     "division_analytics": {...}}
+    {"record": "team", "division": "atlantic", "team": "Boston Celtics", ...}
+  Consumers can process the file line by line without parsing it whole.
+
+Both writers go through publish.atomic_write, so a reader never sees a
+half-written file even though it is produced incrementally.
+==============================================================================
+"""
+
+import json
+
+from publish import atomic_write
+
+
+INDENT = 2
+
+
+class StreamedObject:
+    """A JSON object whose (key, value) pairs are produced lazily."""
+
+    __slots__ = ('pairs',)
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+
+def _indented(text, level):
+    # JSON strings never contain a raw newline, so every "\n" is layout
+    return text.replace('\n', '\n' + ' ' * (INDENT * level))
+
+
+def _is_plain(value):
+    return isinstance(value, (list, tuple, str, int, float, bool)) or value is None
+
+
+def _write_value(write, value, level):
+    if isinstance(value, StreamedObject):
+        _write_container(write, '{', '}', value.pairs, level, is_object=True)
+    elif isinstance(value, dict):
+        if not _has_lazy(value):
+            write(_indented(json.dumps(value, indent=INDENT), level))  # One C-encoder call
+        else:
+            _write_container(write, '{', '}', value.items(), level, is_object=True)
+    elif _is_plain(value):
+        write(_indented(json.dumps(value, indent=INDENT), level))
+    else:
+        _write_container(write, '[', ']', value, level, is_object=False)
+
+
+def _has_lazy(obj):
+    """True if a dict holds a StreamedObject / iterator anywhere inside."""
+    for v in obj.values():
+        if isinstance(v, dict):
+            if _has_lazy(v):
+                return True
+        elif not _is_plain(v):
+            return True
+    return False
+
+
+def _write_container(write, opening, closing, items, level, is_object):
+    prefix = '\n' + ' ' * (INDENT * (level + 1))
+    empty = True
+    for item in items:
+        write((opening if empty else ',') + prefix)
+        empty = False
+        if is_object:
+            key, item = item
+            write(json.dumps(key) + ': ')
+        _write_value(write, item, level + 1)
+    write(opening + closing if empty else '\n' + ' ' * (INDENT * level) + closing)
+
+
+def write_json_stream(path, obj):
+    """Writes obj like json.dump(obj, f, indent=2), consuming lazy parts as it goes."""
+    with atomic_write(path) as f:
+        _write_value(f.write, obj, 0)
+
+
+def write_ndjson_stream(path, meta, divisions):
+    """
+    Writes the NDJSON form of the dashboard output.
+
+    divisions: iterator of (division key, division dict) where the dict's
+    "teams" value may itself be an iterator of team objects.
+    """
+    dumps = json.JSONEncoder(separators=(',', ':')).encode
+    with atomic_write(path, encoding='utf-8', newline='\n') as f:
+        f.write(dumps({"record": "meta", "meta": meta}) + '\n')
+        for div_key, division in divisions:
+            teams = division["teams"]
+            header = {k: v for k, v in division.items() if k != "teams"}
+            f.write(dumps({"record": "division", "key": div_key, **header}) + '\n')
+            for team in teams:
+                f.write(dumps({"record": "team", "division": div_key, **team}) + '\n')
@@ -0,0 +1,57 @@
+"""
+==============================================================================
+NBA ORACLE — Team Identifiers
+==============================================================================
+Maps full team names (as they appear in the Azure ML CSVs) to the 3-letter
+NBA abbreviations the dashboard uses. Same table as process_predictions.js.
+
+Teams missing from TEAM_IDS (other leagues, synthetic benchmark data) get
+their upper-cased slug ("Synthetic Team D01-0001" → "SYNTHETIC-TEAM-D01-0001"),
+which is unique as long as the names are. IDs are used as keys (matchup
+index, oracle stats, shard index), so unique_team_ids() rejects a build in
+which two teams would still share one.
+==============================================================================
+"""
+
+import re
+
+TEAM_IDS = {
+    "Boston Celtics": "BOS", "Brooklyn Nets": "BKN", "New York Knicks": "NYK",
+    "Philadelphia 76ers": "PHI", "Toronto Raptors": "TOR",
+    "Chicago Bulls": "CHI", "Cleveland Cavaliers": "CLE", "Detroit Pistons": "DET",
+    "Indiana Pacers": "IND", "Milwaukee Bucks": "MIL",
+    "Atlanta Hawks": "ATL", "Charlotte Hornets": "CHA", "Miami Heat": "MIA",
+    "Orlando Magic": "ORL", "Washington Wizards": "WAS",
+    "Denver Nuggets": "DEN", "Minnesota Timberwolves": "MIN",
+    "Oklahoma City Thunder": "OKC", "Portland Trail Blazers": "POR", "Utah Jazz": "UTA",
+    "Golden State Warriors": "GSW", "LA Clippers": "LAC", "Los Angeles Lakers": "LAL",
+    "Phoenix Suns": "PHX", "Sacramento Kings": "SAC",
+    "Dallas Mavericks": "DAL", "Houston Rockets": "HOU", "Memphis Grizzlies": "MEM",
+    "New Orleans Pelicans": "NOP", "San Antonio Spurs": "SAS"
+}
+
+
+class TeamIdCollision(ValueError):
+    """Raised when two teams of one build would get the same ID."""
+
+
+def team_slug(name):
+    """"Boston Celtics" → "boston-celtics" (shard file name, URL alias)."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def team_id(name):
+    """3-letter ID for a team name; unknown teams fall back to their upper-cased slug."""
+    return TEAM_IDS.get(name) or team_slug(name).upper()
+
+
+def unique_team_ids(names):
+    """team_id() for every name, in order; raises TeamIdCollision on a duplicate."""
+    ids = [team_id(name) for name in names]
+    seen = {}  # ID → position of the first team that got it
+    for i, tid in enumerate(ids):
+        first = seen.setdefault(tid, i)
+        if first != i:
+            raise TeamIdCollision(
+                f"{names[first]!r} and {names[i]!r} both map to team ID {tid!r}")
+    return ids
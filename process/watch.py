@@ -0,0 +1,130 @@
+"""
+==============================================================================
+NBA ORACLE — Watch Mode (rebuild when Azure ML drops new predictions)
+==============================================================================
+Purpose: Keeps the dashboard JSON fresh without anyone rerunning the
+         post-processor by hand (process_predictions.py --watch).
+
+HOW IT WORKS:
+  1. Poll the prediction folder every `interval` seconds and compare each
+     matching file's (mtime, size) with the previous poll. Polling needs no
+     extra packages and behaves the same on every OS and network share.
+  2. Debounce: Azure ML writes several CSVs in a burst, and a large CSV
+     may take a while to finish. Nothing is rebuilt until the folder has
+     been quiet for `debounce` seconds.
+  3. Rebuild: the build callback runs process_csvs(), which re-parses only
+     the CSVs whose hash changed (build_cache.py) and publishes every output
+     atomically (publish.py).
+  4. Report: latency = publish time − modification time of the EARLIEST
+     changed file, i.e. "file drop → dashboard sees it". A summary
+     (p50 / p95 / max) is printed when the watcher stops (Ctrl+C).
+
+A build that fails (e.g. a CSV with a broken header) is logged and the
+watcher keeps running; the next change to the folder triggers a new attempt.
+That includes the initial build before watching starts (try_build).
+==============================================================================
+"""
+
+import glob
+import logging
+import os
+import time
+
+
+log = logging.getLogger('watch')
+
+
+def snapshot(folder, pattern='*.csv'):
+    """{path: (mtime_ns, size)} for every file in folder matching pattern."""
+    files = {}
+    for path in glob.glob(os.path.join(folder, pattern)):
+        try:
+            st = os.stat(path)
+        except OSError:  # Deleted between glob() and stat()
+            continue
+        files[path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def changed_paths(before, after):
+    """Paths that were added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return "no rebuilds published"
+    return (f"{len(latencies)} rebuild(s): p50 {percentile(latencies, 50):.2f}s, "
+            f"p95 {percentile(latencies, 95):.2f}s, max {max(latencies):.2f}s")
+
+
+def try_build(build, failure="Rebuild failed; waiting for the next change"):
+    """build(), but a failure is logged and reported as False (nothing published)."""
+    try:
+        return build()
+    except Exception:
+        log.exception(failure)
+        return False
+
+
+def watch(folder, build, pattern='*.csv', interval=1.0, debounce=2.0, max_builds=None):
+    """
+    Calls build() after every debounced burst of changes in folder.
+
+    build() returns True when it published new outputs (False = nothing to
+    do). Returns the list of file-drop → publish latencies in seconds.
+    max_builds stops the loop after that many rebuilds (None = run until
+    interrupted).
+    """
+    print(f"Watching {folder} for {pattern} (poll {interval}s, debounce {debounce}s). "
+          f"Press Ctrl+C to stop.")
+    latencies = []
+    builds = 0
+    last = snapshot(folder, pattern)
+    pending = set()     # paths changed since the last rebuild
+    first_drop = None   # earliest modification time among them (epoch seconds)
+    last_change = None  # when the most recent change was seen
+
+    try:
+        while max_builds is None or builds < max_builds:
+            time.sleep(interval)
+            current = snapshot(folder, pattern)
+            changed = changed_paths(last, current)
+            now = time.time()
+            if changed:
+                last = current
+                pending |= changed
+                last_change = now
+                drops = [current[p][0] / 1e9 for p in changed if p in current]
+                drop = min(drops) if drops else now  # A deletion "drops" when seen
+                first_drop = drop if first_drop is None else min(first_drop, drop)
+                continue
+            if not pending or now - last_change < debounce:
+                continue
+
+            names = ", ".join(sorted(os.path.basename(p) for p in pending))
+            log.info("Rebuilding after changes to %s", names)
+            started = time.time()
+            published = try_build(build)
+            finished = time.time()
+            builds += 1
+
+            if published:
+                latency = finished - first_drop
+                latencies.append(latency)
+                print(f"[watch] {len(pending)} file(s) changed → published in "
+                      f"{finished - started:.2f}s, {latency:.2f}s after the first file drop")
+            pending.clear()
+            first_drop = None
+    except KeyboardInterrupt:
+        pass
+
+    print(f"[watch] stopped — {latency_summary(latencies)}")
+    return latencies